@@ -1,32 +1,394 @@
+# eventlet must monkey-patch the stdlib before anything else imports it,
+# so this stays at the very top; threading mode remains the fallback
+try:
+    import eventlet
+    eventlet.monkey_patch()
+    EVENTLET_AVAILABLE = True
+except ImportError:
+    EVENTLET_AVAILABLE = False
+
 from flask import Flask, render_template, request, jsonify, session
 from flask_socketio import SocketIO, emit
-import os
+from werkzeug.utils import secure_filename
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import OrderedDict
+import atexit
 import base64
+import hashlib
+import io
+import logging
+import os
 import json
-import uuid
+import queue
+import secrets
+import shutil
 from dotenv import load_dotenv
 import threading
 import tempfile
+import time
+import numpy as np
 import nltk
-nltk.download('punkt_tab')
+from pydub import AudioSegment
+from pydub.silence import detect_nonsilent
 
 # Import services
-from services.transcription_service import transcription_service
+from services.transcription_service import StreamingTranscriber, transcription_service
 from services.summarization_service import summarization_service
 from services.action_items_service import action_items_service
 from services.sentiment_service import sentiment_service
+from session_store import SessionStore
 from config import current_config as config
 
 # Load environment variables
 load_dotenv()
 
+# Configure logging; per-chunk messages are DEBUG so production (INFO)
+# skips the formatting and write entirely
+logging.basicConfig(level=os.getenv('LOGLEVEL', 'INFO'))
+logger = logging.getLogger(__name__)
+
 # Initialize Flask app
 app = Flask(__name__)
 app.config.from_object(config)
-socketio = SocketIO(app, cors_allowed_origins="*", ping_timeout=60, ping_interval=25)
+socketio = SocketIO(app, cors_allowed_origins="*", ping_timeout=60, ping_interval=25,
+                    message_queue=config.REDIS_URL,
+                    async_mode=os.getenv(
+                        'SOCKETIO_ASYNC_MODE',
+                        'eventlet' if EVENTLET_AVAILABLE else None))
+
+# Snapshot frequently used settings; app.config lookups go through the
+# Flask config proxy on every access
+UPLOAD_FOLDER = app.config['UPLOAD_FOLDER']
+ALLOWED_EXTENSIONS = frozenset(e.lower() for e in app.config['ALLOWED_EXTENSIONS'])
+os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+
+# Storage for ongoing sessions; Redis-backed when REDIS_URL is configured so
+# multiple workers can share state, in-process otherwise
+sessions = SessionStore(redis_url=config.REDIS_URL)
+
+# Bounded worker pool for audio processing jobs; sized to the available
+# transcription capacity so bursts queue instead of spawning threads
+executor = ThreadPoolExecutor(max_workers=int(os.getenv('ASR_WORKERS', '2')))
+atexit.register(executor.shutdown, wait=False)
+
+# Streamed audio is 16 kHz 16-bit mono PCM. Each session keeps one rolling
+# buffer that is re-hypothesized as chunks arrive; words are committed with
+# the LocalAgreement-2 policy (a word is final once two consecutive
+# hypotheses agree on it), and the buffer is dropped at an utterance
+# boundary (silence) or when it reaches 30 s
+STREAM_SAMPLE_RATE = 16000
+STREAM_SAMPLE_WIDTH = 2
+MAX_STREAM_BUFFER = 30 * STREAM_SAMPLE_RATE * STREAM_SAMPLE_WIDTH
+SILENCE_RMS = int(os.getenv('SILENCE_RMS', '300'))
+MIN_EMIT_INTERVAL = 0.25  # seconds between interim updates per session
+# How many recently stopped stream sessions the batch worker remembers
+# so late-arriving queued chunks for them can be discarded
+_STOPPED_SESSIONS_MAX = 1024
+
+def _is_silence(chunk):
+    """Check whether a PCM chunk is below the silence threshold.
+
+    Args:
+        chunk (bytes): Raw PCM audio
+
+    Returns:
+        bool: True if the chunk's RMS energy reads as silence
+    """
+    if not chunk:
+        return True
+    # Truncate to whole int16 samples and compute RMS as one vectorized op
+    usable = len(chunk) - (len(chunk) % STREAM_SAMPLE_WIDTH)
+    if not usable:
+        return True
+    pcm = np.frombuffer(chunk[:usable], dtype=np.int16)
+    rms = np.sqrt(np.square(pcm, dtype=np.int64).mean())
+    return rms < SILENCE_RMS
+
+# Results of completed file runs keyed by content digest, so re-uploading
+# the same recording replays the pipeline output instead of re-running it.
+# Bounded the same way as the NLP cache below so long-running workers
+# don't accumulate every transcript ever processed
+_RESULTS_CACHE_SIZE = 64
+_results_cache = OrderedDict()
+_results_cache_lock = threading.Lock()
+
+def _results_cache_get(digest):
+    """Look up a cached pipeline run, refreshing its LRU position.
+
+    Args:
+        digest (str): Content digest of the recording
+
+    Returns:
+        dict or None: Cached results entry if present
+    """
+    with _results_cache_lock:
+        entry = _results_cache.get(digest)
+        if entry is not None:
+            _results_cache.move_to_end(digest)
+        return entry
+
+def _results_cache_put(digest, entry):
+    """Insert a pipeline results entry, evicting the oldest past the cap.
+
+    Args:
+        digest (str): Content digest of the recording
+        entry (dict): Pipeline results keyed by stage
+    """
+    with _results_cache_lock:
+        _results_cache[digest] = entry
+        _results_cache.move_to_end(digest)
+        while len(_results_cache) > _RESULTS_CACHE_SIZE:
+            _results_cache.popitem(last=False)
+
+# Memoized NLP stage outputs keyed by (transcript hash, stage, model);
+# identical transcripts (demo flows, retries) become dict hits instead of
+# re-running the post-transcription stages
+_NLP_CACHE_SIZE = 256
+_nlp_cache = OrderedDict()
+_nlp_cache_lock = threading.Lock()
+
+def _cached_stage(kind, model, fn, transcript):
+    """Run an NLP stage with LRU memoization on the transcript.
+
+    Args:
+        kind (str): Stage name ('summary', 'action_items' or 'sentiment')
+        model (str): Configured model for the stage, part of the cache key
+        fn (callable): Service call taking the transcript
+        transcript (str): Meeting transcript
+
+    Returns:
+        dict: Stage result
+    """
+    digest = hashlib.blake2b(transcript.encode('utf-8'), digest_size=16).hexdigest()
+    key = (digest, kind, model)
+    with _nlp_cache_lock:
+        if key in _nlp_cache:
+            _nlp_cache.move_to_end(key)
+            return _nlp_cache[key]
+
+    result = fn(transcript)
+
+    if result.get('status') == 'success':
+        with _nlp_cache_lock:
+            _nlp_cache[key] = result
+            _nlp_cache.move_to_end(key)
+            while len(_nlp_cache) > _NLP_CACHE_SIZE:
+                _nlp_cache.popitem(last=False)
+    return result
+
+def _file_digest(filepath):
+    """Compute a content digest of a file.
+
+    Args:
+        filepath (str): Path to the file
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        while chunk := f.read(1 << 20):
+            h.update(chunk)
+    return h.hexdigest()
+
+class MicroBatcher:
+    """Coalesces streamed audio chunks into short batch windows.
+
+    Socket handlers only enqueue; a background task drains the queue for up
+    to `wait` seconds or `max_batch` chunks, groups them per session, and
+    advances each session's rolling transcription state once per window.
+    """
+
+    def __init__(self, max_batch=8, wait=0.05):
+        """Initialize the batcher.
+
+        Args:
+            max_batch (int): Max chunks drained per batch window
+            wait (float): Seconds to wait for more chunks before flushing
+        """
+        self.max_batch = max_batch
+        self.wait = wait
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = False
+        self._states = {}
+        # Recently stopped session IDs, so chunks still sitting in the
+        # queue when a stream ends are dropped instead of silently
+        # recreating the state after the final transcript went out.
+        # Session IDs are never reused, so a bounded LRU is safe
+        self._stopped = OrderedDict()
+
+    def _mark_stopped(self, session_id):
+        """Record that a session's stream has ended.
+
+        Args:
+            session_id (str): Processing session ID
+        """
+        self._stopped[session_id] = None
+        self._stopped.move_to_end(session_id)
+        while len(self._stopped) > _STOPPED_SESSIONS_MAX:
+            self._stopped.popitem(last=False)
+
+    def ensure_started(self):
+        """Start the drain loop if it isn't running yet.
+
+        Uses socketio.start_background_task so the worker cooperates with
+        whatever async mode the server runs under.
+        """
+        with self._lock:
+            if not self._started:
+                socketio.start_background_task(self._run)
+                self._started = True
+
+    def submit(self, sid, session_id, audio_data):
+        """Queue a chunk for the next batch window.
+
+        Args:
+            sid (str): Socket.IO session ID
+            session_id (str): Processing session ID
+            audio_data (bytes): Raw PCM chunk
+        """
+        if session_id in self._stopped:
+            return
+        self.ensure_started()
+        self._queue.put((sid, session_id, audio_data))
+
+    def flush_session(self, session_id, commit_all=True):
+        """Flush any buffered audio for a session and drop its state.
+
+        Args:
+            session_id (str): Processing session ID
+            commit_all (bool): Commit the final hypothesis wholesale
+        """
+        # Mark the session stopped first so chunks still queued (or racing
+        # in) can't recreate the state after this flush
+        self._mark_stopped(session_id)
+        for key in [k for k in self._states if k[1] == session_id]:
+            state = self._states.pop(key)
+            try:
+                self._advance(key[0], session_id, state, commit_all=commit_all)
+            except Exception as e:
+                logger.error(f"Error flushing stream buffer: {e}")
+
+    def flush_sid(self, sid, commit_all=True):
+        """Flush and drop all stream state owned by a socket connection.
+
+        Called on disconnect so abandoned streams don't leak their rolling
+        buffers (up to 30s of PCM each).
+
+        Args:
+            sid (str): Socket.IO session ID
+            commit_all (bool): Commit the final hypothesis wholesale
+
+        Returns:
+            list: Session IDs whose state was flushed
+        """
+        flushed = []
+        for key in [k for k in self._states if k[0] == sid]:
+            self._mark_stopped(key[1])
+            state = self._states.pop(key)
+            try:
+                self._advance(sid, key[1], state, commit_all=commit_all)
+            except Exception as e:
+                logger.error(f"Error flushing stream buffer: {e}")
+            flushed.append(key[1])
+        return flushed
+
+    def _run(self):
+        """Drain queued audio chunks and advance sessions in batches."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # Coalesce the drained chunks per session so each session gets
+            # one transcription call per batch window instead of one per chunk
+            grouped = {}
+            for sid, session_id, audio_data in batch:
+                # Chunks that were queued before their stream stopped get
+                # dropped here; appending them would grow the transcript
+                # after the final one was already emitted
+                if session_id in self._stopped:
+                    continue
+                grouped.setdefault((sid, session_id), []).append(audio_data)
+
+            for (sid, session_id), chunks in grouped.items():
+                state = self._states.setdefault((sid, session_id), {
+                    'stream': StreamingTranscriber(transcription_service),
+                    'last_emit': 0.0
+                })
+                data = b''.join(chunks)
+                state['stream'].push(data)
+
+                # An utterance boundary (silent tail) or a full buffer means
+                # the current hypothesis can be committed wholesale and the
+                # audio dropped; otherwise only the agreed prefix is committed
+                boundary = (_is_silence(data)
+                            or len(state['stream'].buffer) >= MAX_STREAM_BUFFER)
+                try:
+                    self._advance(sid, session_id, state, commit_all=boundary)
+                except Exception as e:
+                    logger.error(f"Error transcribing stream buffer: {e}")
+
+    def _advance(self, sid, session_id, state, commit_all=False):
+        """Advance a session's streaming transcriber and emit updates.
+
+        Args:
+            sid (str): Socket.IO session ID for targeted emits
+            session_id (str): Processing session ID
+            state (dict): Stream state (transcriber, last interim emit)
+            commit_all (bool): Commit the full hypothesis and drop the buffer
+        """
+        stream = state['stream']
+        if not stream.buffer:
+            return
+
+        result = stream.advance(commit_all=commit_all)
+        if result['status'] != 'success':
+            logger.error(f"Error processing audio chunk: {result.get('error')}")
+            return
+
+        if result['committed'] and session_id in sessions:
+            sessions.append_transcript(session_id, result['committed'])
+            socketio.emit('transcription_update', {
+                'text': result['committed'],
+                'final': True
+            }, to=sid)
+
+        # Send the still-unstable tail so the client can render a live
+        # preview; interim updates are coalesced to ~4 Hz so a fast chunk
+        # cadence doesn't flood the socket write path (committed text above
+        # is never dropped)
+        now = time.monotonic()
+        if result['pending'] and now - state['last_emit'] >= MIN_EMIT_INTERVAL:
+            socketio.emit('transcription_update', {
+                'text': result['pending'],
+                'final': False
+            }, to=sid)
+            state['last_emit'] = now
 
-# Global storage for ongoing sessions
-sessions = {}
+# Per-codec payload decoders, bound once per stream in start_stream so the
+# per-chunk path is one indirect call instead of isinstance dispatch.
+# Decoder functions aren't JSON-serializable, so the binding lives in this
+# process-local dict rather than in the session store; chunks always arrive
+# on the same worker that accepted the stream
+_DECODERS = {
+    'binary': bytes,
+    'base64': base64.b64decode,
+}
+_session_decoders = {}
+
+# Micro-batching for streamed audio chunks: the socket handler only
+# enqueues, the batcher drains and transcribes per batch window
+micro_batcher = MicroBatcher(max_batch=int(os.getenv('MAX_BATCH', '8')),
+                             wait=float(os.getenv('BATCH_WAIT', '0.05')))
 
 # Routes
 @app.route('/')
@@ -43,112 +405,141 @@ def dashboard():
 @app.route('/api/upload', methods=['POST'])
 def upload_audio():
     """Handle audio file uploads."""
-    print("Upload request received")
-    print(f"Request files: {request.files}")
+    logger.debug("Upload request received: %s", request.files)
     
     if 'file' not in request.files:
-        print("Error: No file part in the request")
+        logger.debug("Error: No file part in the request")
         return jsonify({'error': 'No file part'}), 400
     
     file = request.files['file']
-    print(f"File received: {file.filename}")
+    logger.debug("File received: %s", file.filename)
     
     if file.filename == '':
-        print("Error: Empty filename")
+        logger.debug("Error: Empty filename")
         return jsonify({'error': 'No selected file'}), 400
     
     # Check if the file extension is allowed
-    extension = os.path.splitext(file.filename)[1].lower()[1:]
-    if extension not in app.config['ALLOWED_EXTENSIONS']:
-        print(f"Error: File type not allowed - {extension}")
-        return jsonify({'error': f'File type not allowed. Allowed types: {", ".join(app.config["ALLOWED_EXTENSIONS"])}'})
+    extension = file.filename.rpartition('.')[2].lower()
+    if extension not in ALLOWED_EXTENSIONS:
+        logger.debug("File type not allowed: %s", extension)
+        return jsonify({'error': f'File type not allowed. Allowed types: {", ".join(ALLOWED_EXTENSIONS)}'})
     
     # Save the file with original filename (without unique prefix)
     # This matches the filename that appears in the URL
     filename = file.filename
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    
-    # Ensure the upload directory exists
-    upload_dir = app.config['UPLOAD_FOLDER']
-    print(f"Making sure upload directory exists: {upload_dir}")
-    os.makedirs(upload_dir, exist_ok=True)
+    filepath = os.path.join(UPLOAD_FOLDER, filename)
     
-    # Save the file
-    print(f"Saving file to: {filepath}")
-    file.save(filepath)
+    # Save the file with a 1 MiB buffer; werkzeug's default file.save copies
+    # in 16 KB chunks, which is thousands of syscalls for a long recording.
+    # Uploads big enough to be spooled to a temp file skip userspace
+    # entirely via sendfile
+    logger.debug("Saving file to: %s", filepath)
+    with open(filepath, 'wb', buffering=1 << 20) as out:
+        if request.content_length and hasattr(os, 'posix_fallocate'):
+            # Reserve the full extent up front to avoid fragmentation
+            try:
+                os.posix_fallocate(out.fileno(), 0, request.content_length)
+            except OSError:
+                pass
+        src = file.stream
+        try:
+            in_fd = src.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            in_fd = None
+        if in_fd is not None and hasattr(os, 'sendfile'):
+            out.flush()
+            size = os.fstat(in_fd).st_size
+            offset = 0
+            while offset < size:
+                offset += os.sendfile(out.fileno(), in_fd, offset, size - offset)
+            written = size
+        else:
+            shutil.copyfileobj(src, out, length=1 << 20)
+            written = out.tell()
+        # content_length covers the whole multipart body, not just the
+        # file part, so the preallocation overshoots; cut the file back
+        # to the bytes actually written
+        out.flush()
+        os.ftruncate(out.fileno(), written)
     
     # Verify file was saved successfully
-    if os.path.exists(filepath):
-        print(f"File saved successfully at {filepath}")
-    else:
-        print(f"ERROR: File not saved at {filepath}")
+    if not os.path.exists(filepath):
+        logger.error("File not saved at %s", filepath)
         return jsonify({'error': 'Failed to save file'}), 500
     
     # Create a new session for this file
-    session_id = str(uuid.uuid4())
-    sessions[session_id] = {
-        'filepath': filepath,
-        'filename': filename,
-        'status': 'processing',
-        'transcript': '',
-        'summary': None,
-        'action_items': None,
-        'sentiment': None
-    }
-    
-    # Start processing in a background thread to avoid blocking
-    processing_thread = threading.Thread(
-        target=process_audio_file,
-        args=(session_id, filepath)
+    session_id = secrets.token_hex(8)
+    sessions.create(
+        session_id,
+        filepath=filepath,
+        filename=filename,
+        status='processing',
+        transcript='',
+        summary=None,
+        action_items=None,
+        sentiment=None
     )
-    processing_thread.daemon = True
-    processing_thread.start()
+    
+    # Submit processing to the worker pool to avoid blocking
+    executor.submit(process_audio_file, session_id, filepath)
     
     return jsonify({
         'message': 'File uploaded successfully',
         'filename': filename,
         'session_id': session_id
     })
-    
-    # Check if the file extension is allowed
-    extension = os.path.splitext(file.filename)[1].lower()[1:]
-    if extension not in app.config['ALLOWED_EXTENSIONS']:
-        return jsonify({'error': f'File type not allowed. Allowed types: {", ".join(app.config["ALLOWED_EXTENSIONS"])}'})
-    
-    # Generate a unique filename to avoid conflicts
-    unique_filename = f"{uuid.uuid4()}_{file.filename}"
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], unique_filename)
-    
-    # Ensure the upload directory exists
-    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-    
-    # Save the file
-    file.save(filepath)
-    
+
+@app.route('/api/upload_stream', methods=['POST'])
+def upload_audio_stream():
+    """Handle raw streamed audio uploads.
+
+    Pipes the request body straight to disk in 1 MiB blocks, skipping the
+    multipart parse (and its buffering) entirely. The filename comes from
+    the X-Filename header. Preferred over /api/upload for large recordings;
+    memory stays constant regardless of upload size.
+    """
+    # The header is attacker-controlled; strip any path components so the
+    # file can only land inside the upload folder
+    filename = secure_filename(request.headers.get('X-Filename', ''))
+    if not filename:
+        return jsonify({'error': 'X-Filename header is required'}), 400
+
+    extension = filename.rpartition('.')[2].lower()
+    if extension not in ALLOWED_EXTENSIONS:
+        logger.debug("File type not allowed: %s", extension)
+        return jsonify({'error': f'File type not allowed. Allowed types: {", ".join(ALLOWED_EXTENSIONS)}'})
+
+    filepath = os.path.join(UPLOAD_FOLDER, filename)
+    logger.debug("Streaming upload to: %s", filepath)
+
+    # Hash while writing so the content digest is ready the moment the
+    # upload finishes, instead of re-reading the file afterwards
+    h = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'wb', buffering=1 << 20) as out:
+        while block := request.stream.read(1 << 20):
+            out.write(block)
+            h.update(block)
+    digest = h.hexdigest()
+
     # Create a new session for this file
-    session_id = str(uuid.uuid4())
-    sessions[session_id] = {
-        'filepath': filepath,
-        'filename': file.filename,
-        'unique_filename': unique_filename,
-        'status': 'processing',
-        'transcript': '',
-        'summary': None,
-        'action_items': None,
-        'sentiment': None
-    }
-    
-    # Start processing in a background thread to avoid blocking
-    processing_thread = threading.Thread(
-        target=process_audio_file,
-        args=(session_id, filepath)
+    session_id = secrets.token_hex(8)
+    sessions.create(
+        session_id,
+        filepath=filepath,
+        filename=filename,
+        status='processing',
+        transcript='',
+        summary=None,
+        action_items=None,
+        sentiment=None
     )
-    processing_thread.daemon = True
-    processing_thread.start()
-    
+
+    # Submit processing to the worker pool to avoid blocking
+    executor.submit(process_audio_file, session_id, filepath, digest=digest)
+
     return jsonify({
         'message': 'File uploaded successfully',
-        'filename': file.filename,
+        'filename': filename,
         'session_id': session_id
     })
 
@@ -156,7 +547,8 @@ def upload_audio():
 def get_sessions():
     """Get list of active sessions."""
     session_list = []
-    for session_id, session_data in sessions.items():
+    for session_id in sessions.ids():
+        session_data = sessions.get(session_id) or {}
         session_list.append({
             'id': session_id,
             'filename': session_data.get('filename', ''),
@@ -171,8 +563,8 @@ def get_status(session_id):
         return jsonify({'error': 'Session not found'}), 404
     
     return jsonify({
-        'status': sessions[session_id]['status'],
-        'progress': sessions[session_id].get('progress', 0)
+        'status': sessions.get_field(session_id, 'status'),
+        'progress': sessions.get_field(session_id, 'progress', 0)
     })
 
 @app.route('/api/results/<session_id>', methods=['GET'])
@@ -181,7 +573,7 @@ def get_results(session_id):
     if session_id not in sessions:
         return jsonify({'error': 'Session not found'}), 404
     
-    session_data = sessions[session_id]
+    session_data = sessions.get(session_id)
     
     # If still processing, return progress info
     if session_data['status'] == 'processing':
@@ -203,28 +595,39 @@ def get_results(session_id):
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection."""
-    print('Client connected')
+    logger.debug('Client connected')
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection."""
-    print('Client disconnected')
+    logger.debug('Client disconnected')
+    # A mid-stream disconnect never reaches stop_stream, so release the
+    # socket's stream buffers and decoder bindings here
+    for session_id in micro_batcher.flush_sid(request.sid):
+        _session_decoders.pop(session_id, None)
 
 @socketio.on('start_stream')
 def handle_start_stream(data):
     """Handle the start of audio streaming."""
-    print('Streaming started')
-    
+    logger.debug('Streaming started')
+
+    # Make sure the batch transcription worker is running
+    micro_batcher.ensure_started()
+
     # Create a new session for this streaming session
-    session_id = str(uuid.uuid4())
-    sessions[session_id] = {
-        'status': 'streaming',
-        'transcript': '',
-        'audio_chunks': [],
-        'summary': None,
-        'action_items': None,
-        'sentiment': None
-    }
+    session_id = secrets.token_hex(8)
+    sessions.create(
+        session_id,
+        status='streaming',
+        transcript='',
+        summary=None,
+        action_items=None,
+        sentiment=None
+    )
+
+    # Bind the payload decoder for this stream once, from the declared codec
+    codec = (data or {}).get('codec', 'binary')
+    _session_decoders[session_id] = _DECODERS.get(codec, bytes)
     
     # Send the session ID back to the client
     emit('session_created', {'session_id': session_id})
@@ -244,66 +647,31 @@ def handle_audio_chunk(data):
     # Handle different formats of audio data
     try:
         if 'audio' in data:
-            # Check if the audio is a base64 string or binary array
-            if isinstance(data['audio'], str):
-                # Decode the base64 audio data
-                audio_data = base64.b64decode(data['audio'])
-            elif isinstance(data['audio'], list):
-                # Convert array back to bytes
-                audio_data = bytes(data['audio'])
-            else:
+            # The decoder was specialized at start_stream for this stream's
+            # codec, so the hot path is a single call with no type dispatch
+            try:
+                decode = _session_decoders.get(session_id, bytes)
+                audio_data = decode(data['audio'])
+            except (TypeError, ValueError):
                 emit('error', {'message': 'Unsupported audio data format'})
                 return
             
-            # Store the audio chunk
-            sessions[session_id]['audio_chunks'].append(audio_data)
-            
-            # Process each chunk immediately for better real-time performance
-            # This might produce more partial results but gives better user feedback
-            result = transcription_service.transcribe_chunk(audio_data)
-            
-            if result['status'] == 'success' and result.get('text'):
-                # Update the transcript
-                text = result.get('text', '').strip()
-                if text:  # Only update if we got actual text
-                    sessions[session_id]['transcript'] += ' ' + text
-                    
-                    # Send the transcription update to the client
-                    emit('transcription_update', {
-                        'text': text,
-                        'final': False
-                    })
-            elif result['status'] == 'error':
-                # Log the error but don't necessarily send to client to avoid flooding
-                print(f"Error processing audio chunk: {result.get('error')}")
-                
-            # Additionally, if we have accumulated multiple chunks, process them together
-            # for better accuracy and send as a more complete update
-            if len(sessions[session_id]['audio_chunks']) % 5 == 0:  # Every 5 chunks
-                # Combine recent chunks for better transcription
-                recent_chunks = sessions[session_id]['audio_chunks'][-5:]
-                combined_chunks = b''.join(recent_chunks)
-                
-                combined_result = transcription_service.transcribe_chunk(combined_chunks)
-                
-                if combined_result['status'] == 'success' and combined_result.get('text'):
-                    # Send the combined transcription update
-                    emit('transcription_update', {
-                        'text': combined_result.get('text', ''),
-                        'final': False
-                    })
-                
+            # Hand the chunk to the batch worker so the socket thread never
+            # blocks on inference; the worker coalesces chunks and emits
+            # transcription updates as batches complete
+            micro_batcher.submit(request.sid, session_id, audio_data)
+
         else:
             emit('error', {'message': 'No audio data provided'})
     
     except Exception as e:
-        print(f"Error processing audio chunk: {e}")
+        logger.error(f"Error processing audio chunk: {e}")
         emit('error', {'message': f'Error processing audio chunk: {e}'})
 
 @socketio.on('manual_test')
 def handle_manual_test(data):
     """Handle a manual test request for processing a transcript."""
-    print("Manual test request received")
+    logger.debug("Manual test request received")
     
     if 'session_id' not in data:
         emit('error', {'message': 'No session ID provided'})
@@ -318,16 +686,17 @@ def handle_manual_test(data):
     
     # Create a session if it doesn't exist
     if session_id not in sessions:
-        sessions[session_id] = {
-            'status': 'testing',
-            'transcript': transcript,
-            'summary': None,
-            'action_items': None,
-            'sentiment': None
-        }
+        sessions.create(
+            session_id,
+            status='testing',
+            transcript=transcript,
+            summary=None,
+            action_items=None,
+            sentiment=None
+        )
     else:
         # Update existing session
-        sessions[session_id]['transcript'] = transcript
+        sessions.update(session_id, transcript=transcript)
     
     # Acknowledge receipt
     emit('status_update', {
@@ -339,18 +708,19 @@ def handle_manual_test(data):
     # Process the transcript
     try:
         # Extract action items
-        print("Extracting action items from test transcript")
-        action_items_result = action_items_service.extract_action_items(transcript)
+        logger.debug("Extracting action items from test transcript")
+        action_items_result = _cached_stage(
+            'action_items', config.SUMMARIZATION_MODEL,
+            action_items_service.extract_action_items, transcript)
         
         if action_items_result['status'] == 'success':
-            sessions[session_id]['action_items'] = action_items_result
-            print(f"Action items extracted: {len(action_items_result.get('items', []))}")
-            print(f"Action items: {action_items_result.get('items', [])}")
+            sessions.update(session_id, action_items=action_items_result)
+            logger.debug("Action items extracted: %d", len(action_items_result.get('items', [])))
             
             # Emit directly to match frontend expectations
             emit('action_items_update', action_items_result)
         else:
-            print(f"Error extracting action items: {action_items_result.get('error')}")
+            logger.error(f"Error extracting action items: {action_items_result.get('error')}")
             emit('error', {'message': f"Error extracting action items: {action_items_result.get('error')}"})
         
         # Update status
@@ -361,51 +731,52 @@ def handle_manual_test(data):
         })
     
     except Exception as e:
-        print(f"Error in manual test: {e}")
+        logger.error(f"Error in manual test: {e}")
         emit('error', {'message': f'Error in manual test: {e}'})
 
 # Add this endpoint to your app.py to handle the chunk uploads
 @app.route('/api/chunk_upload', methods=['POST'])
 def upload_audio_chunk():
     """Handle audio chunk uploads from streaming."""
-    print("Audio chunk upload request received")
+    logger.debug("Audio chunk upload request received")
     
     if 'file' not in request.files:
-        print("Error: No file part in the request")
+        logger.debug("Error: No file part in the request")
         return jsonify({'error': 'No file part'}), 400
     
     file = request.files['file']
     session_id = request.form.get('session_id', '')
     
     if not session_id:
-        print("Error: No session ID provided")
+        logger.debug("Error: No session ID provided")
         return jsonify({'error': 'No session ID provided'}), 400
     
     if file.filename == '':
-        print("Error: Empty filename")
+        logger.debug("Error: Empty filename")
         return jsonify({'error': 'No selected file'}), 400
     
     # Check if session exists
     if session_id not in sessions:
-        print(f"Error: Invalid session ID: {session_id}")
+        logger.debug("Invalid session ID: %s", session_id)
         return jsonify({'error': 'Invalid session ID'}), 400
     
     # Create a temporary file to store the chunk
     with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as temp:
-        print(f"Saving chunk to temp file: {temp.name}")
+        logger.debug("Saving chunk to temp file: %s", temp.name)
         file.save(temp.name)
         temp_path = temp.name
     
     try:
-        # Process the chunk
-        result = transcription_service.transcribe_file(temp_path)
+        # Process the chunk; streamed chunks are ephemeral one-off inputs,
+        # so don't let each one become an entry in the transcription cache
+        result = transcription_service.transcribe_file(temp_path, use_cache=False)
         
         # Clean up the temporary file
         os.unlink(temp_path)
         
         if result['status'] == 'success':
             # Update the transcript in the session
-            sessions[session_id]['transcript'] += ' ' + result.get('text', '')
+            sessions.append_transcript(session_id, result.get('text', ''))
             
             # Emit transcript update
             socketio.emit('transcription_update', {
@@ -419,14 +790,14 @@ def upload_audio_chunk():
                 'text': result.get('text', '')
             })
         else:
-            print(f"Error processing chunk: {result.get('error')}")
+            logger.error(f"Error processing chunk: {result.get('error')}")
             return jsonify({
                 'status': 'error',
                 'error': result.get('error')
             }), 400
             
     except Exception as e:
-        print(f"Error processing audio chunk: {e}")
+        logger.error(f"Error processing audio chunk: {e}")
         # Clean up the temporary file
         if os.path.exists(temp_path):
             os.unlink(temp_path)
@@ -447,10 +818,11 @@ def handle_request_transcript(data):
         return
     
     # Send the current full transcript
-    if 'transcript' in sessions[session_id] and sessions[session_id]['transcript']:
+    transcript = sessions.get_field(session_id, 'transcript', '')
+    if transcript:
         emit('transcription_complete', {
             'session_id': session_id,
-            'text': sessions[session_id]['transcript']
+            'text': transcript
         })
     else:
         emit('transcription_update', {
@@ -461,7 +833,7 @@ def handle_request_transcript(data):
 @socketio.on('stop_stream')
 def handle_stop_stream(data):
     """Handle the end of audio streaming."""
-    print(f"Stop stream request received: {data}")
+    logger.debug("Stop stream request received: %s", data)
     
     if 'session_id' not in data:
         emit('error', {'message': 'No session ID provided'})
@@ -472,190 +844,320 @@ def handle_stop_stream(data):
         emit('error', {'message': 'Invalid session ID'})
         return
     
+    # Flush any audio still sitting in the session's rolling buffer
+    micro_batcher.flush_session(session_id)
+    _session_decoders.pop(session_id, None)
+
     # Update session status
-    sessions[session_id]['status'] = 'processing'
+    sessions.update(session_id, status='processing')
     
     # Emit processing started event
     emit('processing_started', {'session_id': session_id})
     
     # Emit the complete transcript back to the client
-    if 'transcript' in sessions[session_id] and sessions[session_id]['transcript']:
+    transcript = sessions.get_field(session_id, 'transcript', '')
+    if transcript:
         emit('transcription_complete', {
             'session_id': session_id,
-            'text': sessions[session_id]['transcript'],
+            'text': transcript,
             'final': True
         })
     
-    # Start processing in a background thread
-    processing_thread = threading.Thread(
-        target=process_stream_results,
-        args=(session_id,)
-    )
-    processing_thread.daemon = True
-    processing_thread.start()
+    # Submit processing to the worker pool
+    executor.submit(process_stream_results, session_id)
 
 @socketio.on('process_file')
 def handle_process_file(data):
     """Handle a request to process an uploaded file."""
-    print(f"Process file request received: {data}")
+    logger.debug("Process file request received: %s", data)
     
     if 'filename' not in data:
-        print("Error: No filename provided in the request")
+        logger.debug("No filename provided in the request")
         emit('error', {'message': 'No filename provided'})
         return
     
     filename = data['filename']
-    filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-    
-    print(f"Looking for file at: {filepath}")
+    filepath = os.path.join(UPLOAD_FOLDER, filename)
     
     if not os.path.exists(filepath):
-        print(f"Error: File not found at {filepath}")
+        logger.error("File not found at %s", filepath)
         emit('error', {'message': f'File not found at {filepath}'})
         return
-        
-    print(f"File found, proceeding with processing: {filepath}")
     
     # Create a new session for this file
-    session_id = str(uuid.uuid4())
-    sessions[session_id] = {
-        'filepath': filepath,
-        'filename': filename,
-        'status': 'processing',
-        'transcript': '',
-        'summary': None,
-        'action_items': None,
-        'sentiment': None
-    }
-    
-    # Start processing in a background thread
-    processing_thread = threading.Thread(
-        target=process_audio_file,
-        args=(session_id, filepath)
+    session_id = secrets.token_hex(8)
+    sessions.create(
+        session_id,
+        filepath=filepath,
+        filename=filename,
+        status='processing',
+        transcript='',
+        summary=None,
+        action_items=None,
+        sentiment=None
     )
-    processing_thread.daemon = True
-    processing_thread.start()
+    
+    # Submit processing to the worker pool
+    executor.submit(process_audio_file, session_id, filepath)
     
     # Send the session ID back to the client
     emit('session_created', {'session_id': session_id})
 
 # Processing functions
-def process_audio_file(session_id, filepath):
+def _run_nlp_stages(session_id, transcript):
+    """Run summary, action items, and sentiment analysis concurrently.
+
+    The three stages only need the transcript and are independent of each
+    other, so they are fanned out to a small pool and each one emits its
+    update as soon as it finishes.
+
+    Args:
+        session_id (str): Session ID
+        transcript (str): Meeting transcript
+    """
+    with ThreadPoolExecutor(max_workers=3) as nlp_executor:
+        futures = {}
+        for kind, model, fn in (
+                ('summary', config.SUMMARIZATION_MODEL, summarization_service.summarize),
+                ('action_items', config.SUMMARIZATION_MODEL, action_items_service.extract_action_items),
+                ('sentiment', config.SENTIMENT_MODEL, sentiment_service.analyze_sentiment)):
+            futures[nlp_executor.submit(_cached_stage, kind, model, fn, transcript)] = kind
+
+        for future in as_completed(futures):
+            _deliver_nlp_result(futures[future], session_id, future)
+
+def _deliver_nlp_result(kind, session_id, future):
+    """Store and emit the result of a finished NLP stage.
+
+    Args:
+        kind (str): Stage name ('summary', 'action_items' or 'sentiment')
+        session_id (str): Session ID
+        future (Future): Completed future holding the stage result
+    """
+    try:
+        result = future.result()
+    except Exception as e:
+        logger.error(f"Error in {kind} stage for session {session_id}: {e}")
+        return
+
+    if result['status'] != 'success':
+        logger.error(f"{kind} failed for session {session_id}: {result.get('error', 'Unknown error')}")
+        return
+
+    digest = sessions.get_field(session_id, 'digest')
+    if digest:
+        with _results_cache_lock:
+            entry = _results_cache.get(digest)
+            if entry is not None:
+                entry[kind] = result
+
+    if kind == 'summary':
+        sessions.update(session_id, summary=result)
+        socketio.emit('summary_update', {
+            'session_id': session_id,
+            'summary': result
+        })
+    elif kind == 'action_items':
+        sessions.update(session_id, action_items=result)
+        # Emit the full result to match frontend expectations
+        payload = dict(result)
+        payload['session_id'] = session_id
+        socketio.emit('action_items_update', payload)
+    else:
+        sessions.update(session_id, sentiment=result)
+        socketio.emit('sentiment_update', {
+            'session_id': session_id,
+            'sentiment': result
+        })
+
+def emit_stage(session_id, stage, progress=None, error=None):
+    """Record a pipeline stage transition and emit it once.
+
+    Each status_update is a JSON serialize plus a write per connected
+    client, so repeated emits of the same stage are skipped.
+
+    Args:
+        session_id (str): Session ID
+        stage (str): Stage name ('transcribing', 'analyzing', ...)
+        progress (int, optional): Progress percentage for the stage
+        error (str, optional): Error detail for the 'error' stage
+    """
+    if sessions.get_field(session_id, 'last_stage') == stage:
+        return
+
+    fields = {'status': stage, 'last_stage': stage}
+    payload = {'session_id': session_id, 'status': stage}
+    if progress is not None:
+        fields['progress'] = progress
+        payload['progress'] = progress
+    if error is not None:
+        fields['error'] = error
+        payload['error'] = error
+    sessions.update(session_id, **fields)
+    socketio.emit('status_update', payload)
+
+def strip_silence(path):
+    """Compact long silences in a recording before transcription.
+
+    Meeting audio is commonly 30-50% silence; collapsing long gaps to a
+    0.5 s placeholder cuts transcription compute roughly in proportion.
+
+    Args:
+        path (str): Path to the audio file
+
+    Returns:
+        str: Path to a compacted temp WAV, or the original path when
+            stripping isn't possible or wouldn't help
+    """
+    try:
+        audio = AudioSegment.from_file(path)
+        spans = detect_nonsilent(audio, min_silence_len=1000,
+                                 silence_thresh=audio.dBFS - 16)
+        if not spans:
+            return path
+
+        gap = AudioSegment.silent(duration=500, frame_rate=audio.frame_rate)
+        compact = audio[spans[0][0]:spans[0][1]]
+        for start, end in spans[1:]:
+            compact = compact + gap + audio[start:end]
+
+        # Not worth a re-encode if nothing meaningful was removed
+        if len(compact) >= len(audio) - 1000:
+            return path
+
+        fd, out_path = tempfile.mkstemp(suffix='.wav')
+        os.close(fd)
+        compact.export(out_path, format='wav')
+        logger.debug("Silence stripping reduced audio from %dms to %dms",
+                     len(audio), len(compact))
+        return out_path
+    except Exception as e:
+        logger.error(f"Silence stripping failed, using original audio: {e}")
+        return path
+
+def _replay_cached_results(session_id, cached):
+    """Populate a session from cached results and emit the normal events.
+
+    Args:
+        session_id (str): Session ID
+        cached (dict): Previously computed pipeline results
+    """
+    transcript = cached.get('transcript', '')
+    sessions.update(session_id, transcript=transcript, progress=40)
+    socketio.emit('transcription_complete', {
+        'session_id': session_id,
+        'text': transcript
+    })
+
+    for kind in ('summary', 'action_items', 'sentiment'):
+        result = cached.get(kind)
+        if result is None:
+            continue
+        if kind == 'summary':
+            sessions.update(session_id, summary=result)
+            socketio.emit('summary_update', {
+                'session_id': session_id,
+                'summary': result
+            })
+        elif kind == 'action_items':
+            sessions.update(session_id, action_items=result)
+            payload = dict(result)
+            payload['session_id'] = session_id
+            socketio.emit('action_items_update', payload)
+        else:
+            sessions.update(session_id, sentiment=result)
+            socketio.emit('sentiment_update', {
+                'session_id': session_id,
+                'sentiment': result
+            })
+
+    emit_stage(session_id, 'completed', progress=100)
+
+def process_audio_file(session_id, filepath, digest=None):
     """Process an uploaded audio file.
     
     Args:
         session_id (str): Session ID
         filepath (str): Path to the audio file
+        digest (str, optional): Content digest computed during upload;
+            when omitted the file is hashed here. Defaults to None.
     """
-    print(f"Starting to process file: {filepath} for session: {session_id}")
+    logger.debug("Starting to process file: %s for session: %s", filepath, session_id)
     try:
-        # Debug: Check if file exists
         if not os.path.exists(filepath):
-            print(f"ERROR: File not found at {filepath}")
+            logger.error("File not found at %s", filepath)
+            return
+
+        # Hashing is effectively free next to a transcription run, so check
+        # whether this exact recording has been processed before
+        if digest is None:
+            digest = _file_digest(filepath)
+        cached = _results_cache_get(digest)
+        if cached is not None and all(
+                k in cached for k in ('summary', 'action_items', 'sentiment')):
+            logger.debug("Replaying cached results for digest %s", digest)
+            _replay_cached_results(session_id, cached)
             return
+        sessions.update(session_id, digest=digest)
+
+        if cached is not None:
+            # A stage failed on the original run; reuse the transcript but
+            # recompute the stages rather than replaying the gap forever
+            transcript = cached.get('transcript', '')
+            sessions.update(session_id, transcript=transcript, progress=40)
+            socketio.emit('transcription_complete', {
+                'session_id': session_id,
+                'text': transcript
+            })
+            emit_stage(session_id, 'analyzing', progress=50)
+            _run_nlp_stages(session_id, transcript)
+            emit_stage(session_id, 'completed', progress=100)
+            return
+
         # Update session status
-        sessions[session_id]['status'] = 'transcribing'
-        sessions[session_id]['progress'] = 10
-        socketio.emit('status_update', {
-            'session_id': session_id,
-            'status': 'transcribing',
-            'progress': 10
-        })
+        emit_stage(session_id, 'transcribing', progress=10)
         
-        # Transcribe the audio file
-        transcription_result = transcription_service.transcribe_file(filepath)
-        
-        if transcription_result['status'] != 'success':
-            sessions[session_id]['status'] = 'error'
-            sessions[session_id]['error'] = transcription_result.get('error', 'Transcription failed')
-            socketio.emit('status_update', {
+        # Stream windows to the client as they finish so the UI fills in
+        # while the rest of the file is still transcribing
+        def on_segment(text):
+            socketio.emit('transcription_update', {
                 'session_id': session_id,
-                'status': 'error',
-                'error': sessions[session_id]['error']
+                'text': text,
+                'final': False
             })
+
+        # Compact long silences, then transcribe the audio file
+        audio_path = strip_silence(filepath)
+        transcription_result = transcription_service.transcribe_file(
+            audio_path, segment_callback=on_segment)
+        if audio_path != filepath and os.path.exists(audio_path):
+            os.unlink(audio_path)
+        
+        if transcription_result['status'] != 'success':
+            error_message = transcription_result.get('error', 'Transcription failed')
+            emit_stage(session_id, 'error', error=error_message)
             return
         
         # Store the transcript
         transcript = transcription_result['text']
-        sessions[session_id]['transcript'] = transcript
-        sessions[session_id]['progress'] = 40
-        # In process_audio_file function
-        print(f"Emitting transcription_complete with text: {transcript[:100]}...")
+        sessions.update(session_id, transcript=transcript, progress=40)
+        _results_cache_put(digest, {'transcript': transcript})
         socketio.emit('transcription_complete', {
             'session_id': session_id,
             'text': transcript
         })
-        print("Emission complete")
-        
-        # Generate summary
-        sessions[session_id]['status'] = 'summarizing'
-        socketio.emit('status_update', {
-            'session_id': session_id,
-            'status': 'summarizing',
-            'progress': 50
-        })
         
-        summary_result = summarization_service.summarize(transcript)
-        
-        if summary_result['status'] == 'success':
-            sessions[session_id]['summary'] = summary_result
-            sessions[session_id]['progress'] = 60
-            socketio.emit('summary_update', {
-                'session_id': session_id,
-                'summary': summary_result
-            })
-        
-        # Extract action items
-        sessions[session_id]['status'] = 'extracting_actions'
-        socketio.emit('status_update', {
-            'session_id': session_id,
-            'status': 'extracting_actions',
-            'progress': 70
-        })
+        # Run the three NLP stages concurrently; each emits as it finishes
+        emit_stage(session_id, 'analyzing', progress=50)
 
-        action_items_result = action_items_service.extract_action_items(transcript)
+        _run_nlp_stages(session_id, transcript)
 
-        if action_items_result['status'] == 'success':
-            sessions[session_id]['action_items'] = action_items_result
-            sessions[session_id]['progress'] = 80
-            # Emit directly to match frontend expectations
-            socketio.emit('action_items_update', action_items_result)
-        
-        # Analyze sentiment
-        sessions[session_id]['status'] = 'analyzing_sentiment'
-        socketio.emit('status_update', {
-            'session_id': session_id,
-            'status': 'analyzing_sentiment',
-            'progress': 90
-        })
-        
-        sentiment_result = sentiment_service.analyze_sentiment(transcript)
-        
-        if sentiment_result['status'] == 'success':
-            sessions[session_id]['sentiment'] = sentiment_result
-            sessions[session_id]['progress'] = 100
-            socketio.emit('sentiment_update', {
-                'session_id': session_id,
-                'sentiment': sentiment_result
-            })
-        
         # Update session status
-        sessions[session_id]['status'] = 'completed'
-        socketio.emit('status_update', {
-            'session_id': session_id,
-            'status': 'completed',
-            'progress': 100
-        })
+        emit_stage(session_id, 'completed', progress=100)
         
     except Exception as e:
-        print(f"Error processing audio file: {e}")
-        sessions[session_id]['status'] = 'error'
-        sessions[session_id]['error'] = str(e)
-        socketio.emit('status_update', {
-            'session_id': session_id,
-            'status': 'error',
-            'error': str(e)
-        })
+        logger.error(f"Error processing audio file: {e}")
+        emit_stage(session_id, 'error', error=str(e))
 
 def process_stream_results(session_id):
     """Process the results of a streaming session.
@@ -665,112 +1167,40 @@ def process_stream_results(session_id):
     """
     try:
         if session_id not in sessions:
-            print(f"Error: Session {session_id} not found")
+            logger.error(f"Error: Session {session_id} not found")
             return
         
         # Get the transcript from the session
-        transcript = sessions[session_id]['transcript']
+        transcript = sessions.get_field(session_id, 'transcript', '')
         
         if not transcript:
-            print(f"Error: No transcript generated for session {session_id}")
-            sessions[session_id]['status'] = 'error'
-            sessions[session_id]['error'] = 'No transcript generated'
-            socketio.emit('status_update', {
-                'session_id': session_id,
-                'status': 'error',
-                'error': 'No transcript generated'
-            })
+            logger.error(f"Error: No transcript generated for session {session_id}")
+            emit_stage(session_id, 'error', error='No transcript generated')
             return
         
-        print(f"Processing stream results for session {session_id} with transcript length: {len(transcript)}")
-        
-        # Generate summary
-        sessions[session_id]['status'] = 'summarizing'
-        socketio.emit('status_update', {
-            'session_id': session_id,
-            'status': 'summarizing',
-            'progress': 50
-        })
-        
-        summary_result = summarization_service.summarize(transcript)
+        logger.debug("Processing stream results for session %s with transcript length: %d", session_id, len(transcript))
         
-        if summary_result['status'] == 'success':
-            sessions[session_id]['summary'] = summary_result
-            print(f"Summary generated for session {session_id}")
-            # Make sure to emit with session_id explicitly in the data
-            socketio.emit('summary_update', {
-                'session_id': session_id,
-                'summary': summary_result
-            })
-        else:
-            print(f"Summary generation failed for session {session_id}: {summary_result.get('error', 'Unknown error')}")
-        
-        # Extract action items
-        sessions[session_id]['status'] = 'extracting_actions'
-        socketio.emit('status_update', {
-            'session_id': session_id,
-            'status': 'extracting_actions',
-            'progress': 70
-        })
-        
-        action_items_result = action_items_service.extract_action_items(transcript)
+        # Run the three NLP stages concurrently; each emits as it finishes
+        emit_stage(session_id, 'analyzing', progress=50)
+
+        _run_nlp_stages(session_id, transcript)
 
-        if action_items_result['status'] == 'success':
-            sessions[session_id]['action_items'] = action_items_result
-            print(f"Action items extracted for session {session_id}: {len(action_items_result.get('items', []))}")
-            # Explicitly include session_id in the emitted data
-            socketio.emit('action_items_update', {
-                'session_id': session_id,
-                'items': action_items_result.get('items', []),
-                'status': action_items_result['status']
-            })
-        else:
-            print(f"Action items extraction failed for session {session_id}: {action_items_result.get('error', 'Unknown error')}")
-                
-        # Analyze sentiment
-        sessions[session_id]['status'] = 'analyzing_sentiment'
-        socketio.emit('status_update', {
-            'session_id': session_id,
-            'status': 'analyzing_sentiment',
-            'progress': 90
-        })
-        
-        sentiment_result = sentiment_service.analyze_sentiment(transcript)
-        
-        if sentiment_result['status'] == 'success':
-            sessions[session_id]['sentiment'] = sentiment_result
-            print(f"Sentiment analysis completed for session {session_id}")
-            # Explicitly include session_id in the emitted data
-            socketio.emit('sentiment_update', {
-                'session_id': session_id,
-                'sentiment': sentiment_result
-            })
-        else:
-            print(f"Sentiment analysis failed for session {session_id}: {sentiment_result.get('error', 'Unknown error')}")
-        
         # Update session status
-        sessions[session_id]['status'] = 'completed'
-        socketio.emit('status_update', {
-            'session_id': session_id,
-            'status': 'completed',
-            'progress': 100
-        })
+        emit_stage(session_id, 'completed', progress=100)
         
-        print(f"Processing completed for session {session_id}")
+        logger.debug("Processing completed for session %s", session_id)
         
     except Exception as e:
-        print(f"Error processing stream results: {e}")
-        sessions[session_id]['status'] = 'error'
-        sessions[session_id]['error'] = str(e)
-        socketio.emit('status_update', {
-            'session_id': session_id,
-            'status': 'error',
-            'error': str(e)
-        })
+        logger.error(f"Error processing stream results: {e}")
+        emit_stage(session_id, 'error', error=str(e))
         
 if __name__ == '__main__':
-    # Ensure upload directory exists
-    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-    
+    # Fetch the sentence tokenizer only if it isn't already on disk; the
+    # unconditional download did a network round trip on every import
+    try:
+        nltk.data.find('tokenizers/punkt_tab')
+    except LookupError:
+        nltk.download('punkt_tab', quiet=True)
+
     # Run the application
     socketio.run(app, debug=app.config['DEBUG'])
\ No newline at end of file
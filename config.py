@@ -15,14 +15,32 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # 16MB default
     ALLOWED_EXTENSIONS = {'mp3', 'wav', 'ogg', 'webm', 'mp4', 'm4a'}
     
+    # Session storage; when set, sessions (and Socket.IO fan-out) go through Redis
+    REDIS_URL = os.getenv('REDIS_URL')
+
     # API Keys and services
     # Replace with your actual API keys when deploying
     # AI service API keys (examples)
     OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
     HUGGINGFACE_API_KEY = os.getenv('HUGGINGFACE_API_KEY')
     
+    # Use the lightweight regex sentence splitter instead of NLTK Punkt
+    FAST_SPLITTER = os.getenv('FAST_SPLITTER', 'False').lower() in ('true', 't', '1', 'yes')
+
+    # Completed summaries are memoized by transcript hash; this caps how
+    # many distinct transcripts stay cached per worker
+    SUMMARY_CACHE_SIZE = int(os.getenv('SUMMARY_CACHE_SIZE', 128))
+
+    # Long transcripts are summarized map-reduce style: chunks above this
+    # many characters are summarized concurrently, then merged
+    MAP_REDUCE_THRESHOLD = int(os.getenv('MAP_REDUCE_THRESHOLD', 24000))
+    MAX_CONCURRENCY = int(os.getenv('MAX_CONCURRENCY', 8))
+
     # Model settings
     TRANSCRIPTION_MODEL = os.getenv('TRANSCRIPTION_MODEL', 'whisper-small')
+    # 'api' uses the OpenAI Whisper endpoint; 'local' runs faster-whisper
+    # INT8 on the CPU when the package is installed (offline, no network)
+    TRANSCRIPTION_BACKEND = os.getenv('TRANSCRIPTION_BACKEND', 'api')
     SUMMARIZATION_MODEL = os.getenv('SUMMARIZATION_MODEL', 'default')
     SENTIMENT_MODEL = os.getenv('SENTIMENT_MODEL', 'default')
 
@@ -0,0 +1,51 @@
+"""Shared NLTK resource bootstrap.
+
+Every service used to run its own nltk.data.find/download block at import
+time, so the same resources were probed on disk several times per process.
+This module keeps one record of what has already been checked so each
+resource costs at most one filesystem probe (and at most one download).
+"""
+import logging
+import os
+import threading
+
+import nltk
+
+logger = logging.getLogger(__name__)
+
+# Resource path -> download package name, for everything the services use
+_PACKAGES = {
+    'tokenizers/punkt': 'punkt',
+    'tokenizers/punkt_tab': 'punkt_tab',
+    'corpora/stopwords': 'stopwords',
+    'sentiment/vader_lexicon.zip': 'vader_lexicon',
+}
+
+_checked = set()
+_lock = threading.Lock()
+
+
+def ensure_resources(*names):
+    """Make sure the named NLTK resources are on disk.
+
+    Each resource is probed (and downloaded if missing) at most once per
+    process, so repeated calls are effectively free. Deployments that
+    bake the data into the image (and point NLTK_DATA at it) skip the
+    filesystem probes and any network fallback entirely.
+
+    Args:
+        *names: Resource paths, e.g. 'tokenizers/punkt'
+    """
+    if os.getenv('NLTK_DATA'):
+        return
+    with _lock:
+        for name in names:
+            if name in _checked:
+                continue
+            try:
+                nltk.data.find(name)
+            except LookupError:
+                package = _PACKAGES.get(name, name.rpartition('/')[2])
+                logger.info(f"Downloading NLTK resource: {package}")
+                nltk.download(package, quiet=True)
+            _checked.add(name)
@@ -0,0 +1,60 @@
+"""Shared instructor-patched OpenAI clients.
+
+OpenAI() builds an httpx connection pool and instructor.patch adds
+Pydantic schema caches, so constructing a client per service instance is
+wasteful and forfeits keep-alive reuse between back-to-back calls. The
+process keeps one sync and one async client here instead.
+"""
+import logging
+import threading
+
+try:
+    import instructor
+    from openai import OpenAI, AsyncOpenAI
+    INSTRUCTOR_AVAILABLE = True
+except ImportError:
+    INSTRUCTOR_AVAILABLE = False
+
+from config import current_config as config
+
+logger = logging.getLogger(__name__)
+
+_sync_client = None
+_async_client = None
+_lock = threading.Lock()
+
+
+def get_instructor_client():
+    """Get the process-wide instructor-patched OpenAI client.
+
+    Returns:
+        The patched client, or None when instructor/openai or the API key
+        is unavailable
+    """
+    global _sync_client
+    if _sync_client is None:
+        if not (INSTRUCTOR_AVAILABLE and config.OPENAI_API_KEY):
+            return None
+        with _lock:
+            if _sync_client is None:
+                _sync_client = instructor.patch(
+                    OpenAI(api_key=config.OPENAI_API_KEY))
+    return _sync_client
+
+
+def get_async_instructor_client():
+    """Get the process-wide instructor-patched AsyncOpenAI client.
+
+    Returns:
+        The patched async client, or None when instructor/openai or the
+        API key is unavailable
+    """
+    global _async_client
+    if _async_client is None:
+        if not (INSTRUCTOR_AVAILABLE and config.OPENAI_API_KEY):
+            return None
+        with _lock:
+            if _async_client is None:
+                _async_client = instructor.patch(
+                    AsyncOpenAI(api_key=config.OPENAI_API_KEY))
+    return _async_client
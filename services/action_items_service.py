@@ -1,7 +1,10 @@
+import asyncio
 import logging
 import re
 import nltk
-from nltk.tokenize import sent_tokenize
+from services._nltk_bootstrap import ensure_resources
+from services._openai_client import get_instructor_client, get_async_instructor_client
+from services.nlp_utils import cached_split_sentences
 from config import current_config as config
 from typing import List, Dict, Optional, Any
 from enum import Enum
@@ -11,21 +14,41 @@ import os
 # Import OpenAI client for the extraction
 try:
     import instructor
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI
     from pydantic import BaseModel, Field
     INSTRUCTOR_AVAILABLE = True
 except ImportError:
     INSTRUCTOR_AVAILABLE = False
 
+# Optional C-backed multi-pattern matcher; one automaton scan replaces the
+# per-phrase checks when available
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Transcripts longer than this are split on sentence boundaries and the
+# chunks extracted concurrently (roughly an 8K-token window)
+CHUNK_CHAR_BUDGET = 24000
+
+# Shared-prefix (trie) encodings of the date vocabularies: the regex engine
+# doesn't factor common suffixes out of plain alternations, so spelling them
+# this way keeps the compiled NFA small and fails fast on branchy text.
+# The month form also accepts the usual three-letter abbreviations
+_MONTHS = r'(Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)'
+_WEEKDAYS = r'((?:mon|tues|wednes|thurs|fri|satur|sun)day)'
+
+# One pass over "10:15:30 Speaker Name: ..." style lines pulls out the
+# timestamp and speaker together, instead of a Python split per line
+_ZOOM_LINE_RE = re.compile(r'^(\d{1,2}:\d{2}(?::\d{2})?)\s+([^:\n]{1,30}):', re.MULTILINE)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Download NLTK resources if not already downloaded
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
+ensure_resources('tokenizers/punkt')
 
 # Define data models for structured extraction
 if INSTRUCTOR_AVAILABLE:
@@ -96,7 +119,8 @@ class ActionItemsService:
         # Check if we have OpenAI API key and instructor available
         if INSTRUCTOR_AVAILABLE and config.OPENAI_API_KEY:
             try:
-                self.openai_client = instructor.patch(OpenAI(api_key=config.OPENAI_API_KEY))
+                self.openai_client = get_instructor_client()
+                self.async_client = get_async_instructor_client()
                 self.use_instructor = True
                 logger.info("Using OpenAI with instructor for enhanced action item extraction")
             except Exception as e:
@@ -152,20 +176,20 @@ class ActionItemsService:
         
         # For deadline extraction
         self.date_patterns = [
-            r'by\s+(\w+day)',  # by Monday, by Tuesday, etc.
+            r'by\s+' + _WEEKDAYS,  # by Monday, by Tuesday, etc.
             r'by\s+(tomorrow|next week|next month)',
             r'by\s+the\s+end\s+of\s+(day|week|month)',
-            r'by\s+(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2})',
+            r'by\s+' + _MONTHS + r'\s+(\d{1,2})',
             r'by\s+(\d{1,2}/\d{1,2})',  # by 10/20
             r'due\s+(today|tomorrow|next week)',
-            r'due\s+by\s+(\w+day)',
-            r'due\s+date\s+is\s+(\w+day)',
-            r'deadline\s+is\s+(\w+day|\d{1,2}/\d{1,2})',
-            r'next\s+(\w+day)',
-            r'this\s+(\w+day)',
+            r'due\s+by\s+' + _WEEKDAYS,
+            r'due\s+date\s+is\s+' + _WEEKDAYS,
+            r'deadline\s+is\s+((?:mon|tues|wednes|thurs|fri|satur|sun)day|\d{1,2}/\d{1,2})',
+            r'next\s+' + _WEEKDAYS,
+            r'this\s+' + _WEEKDAYS,
             r'(today|tomorrow)',
-            r'(\d{1,2})\s*(st|nd|rd|th)\s+of\s+(January|February|March|April|May|June|July|August|September|October|November|December)',
-            r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+(\d{1,2})',
+            r'(\d{1,2})\s*(st|nd|rd|th)\s+of\s+' + _MONTHS,
+            _MONTHS + r'\s+(\d{1,2})',
             r'EOD',
             r'COB',
             r'end of (day|week|month)',
@@ -185,6 +209,41 @@ class ActionItemsService:
             r'([\w\s]+),\s+can you',
             r'([\w\s]+)\s+agreed to',
         ]
+
+        # Compile once; re.search on raw strings re-checks the pattern cache
+        # on every call, and these run per sentence. Plain substring
+        # semantics (no word boundaries) to stay equivalent to the
+        # Aho-Corasick automaton below, which matches raw substrings
+        self._action_re = re.compile(
+            "|".join(re.escape(p) for p in self.action_phrases),
+            re.IGNORECASE)
+        # Bytes twin of the alternation: matching over bytes skips the
+        # Unicode case tables, which is noticeably faster on the one
+        # whole-transcript prefilter scan (transcripts are usually ASCII)
+        self._action_re_bytes = re.compile(
+            self._action_re.pattern.encode('ascii'), re.IGNORECASE)
+        # Single-word indicators become O(1) set hits before the full scan
+        self._action_words = frozenset(
+            p.lower() for p in self.action_phrases if ' ' not in p)
+
+        # With pyahocorasick installed, all phrases are matched in one
+        # automaton pass regardless of how many there are
+        self._action_ac = None
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for phrase in self.action_phrases:
+                automaton.add_word(phrase.lower(), phrase)
+            automaton.make_automaton()
+            self._action_ac = automaton
+        self._date_res = [re.compile(p, re.IGNORECASE) for p in self.date_patterns]
+        # All date patterns fused into one alternation: sentences without a
+        # deadline (the common case) are rejected by a single scan instead
+        # of one per pattern. Named wrappers record which pattern hit so the
+        # per-pattern groups can be pulled out on the rare match
+        self._deadline_re = re.compile(
+            "|".join(f"(?P<g{i}>{p})" for i, p in enumerate(self.date_patterns)),
+            re.IGNORECASE)
+        self._assignee_res = [re.compile(p, re.IGNORECASE) for p in self.assignee_patterns]
     
     def extract_action_items(self, text):
         """Extract action items from text.
@@ -245,33 +304,18 @@ class ActionItemsService:
         Preprocess a transcript to identify speakers and structure the content.
         This function handles different transcription formats.
         """
-        # Detect if the transcript has timestamps and speaker information
-        lines = transcript_text.strip().split('\n')
-        transcript_data = {
+        # One regex pass finds "10:15:30 Speaker Name:" lines, extracting
+        # timestamp and speaker together in the C engine
+        matches = _ZOOM_LINE_RE.findall(transcript_text)
+        speaker_set = {speaker.strip() for _, speaker in matches}
+        speaker_set.discard('')
+
+        return {
             "processed_text": transcript_text,
-            "has_timestamps": False,
-            "has_speakers": False,
-            "speaker_names": []
+            "has_timestamps": bool(matches),
+            "has_speakers": bool(speaker_set),
+            "speaker_names": list(speaker_set)
         }
-        
-        # Check for typical Zoom transcript format patterns
-        speaker_set = set()
-        for line in lines:
-            # Common Zoom transcript format: "10:15:30 Speaker Name: Text here"
-            if ':' in line:
-                parts = line.split(':', 2)
-                if len(parts) >= 3:
-                    potential_speaker = parts[1].strip()
-                    if len(potential_speaker) > 0 and len(potential_speaker) < 30:  # Reasonable name length
-                        speaker_set.add(potential_speaker)
-                        transcript_data["has_speakers"] = True
-                    
-                    # Check if first part could be a timestamp
-                    if ':' in parts[0] and any(c.isdigit() for c in parts[0]):
-                        transcript_data["has_timestamps"] = True
-        
-        transcript_data["speaker_names"] = list(speaker_set)
-        return transcript_data
     
     def _ai_powered_extraction(self, text, transcript_data):
         """Extract action items using AI-powered approach with structured output.
@@ -290,7 +334,11 @@ class ActionItemsService:
                 "has_timestamps": transcript_data["has_timestamps"],
                 "detected_speakers": transcript_data["speaker_names"]
             }
-            
+
+            # Long transcripts are chunked and extracted concurrently
+            if len(text) > CHUNK_CHAR_BUDGET:
+                return self._chunked_extraction(text, transcript_info)
+
             # Use OpenAI with instructor for structured output
             response = self.openai_client.chat.completions.create(
                 model="gpt-4-turbo-preview",  # Use an appropriate model that's available
@@ -311,6 +359,110 @@ class ActionItemsService:
             # Fallback to rule-based extraction
             return self._rule_based_extraction(text)
     
+    def _split_into_chunks(self, text):
+        """Split a transcript on sentence boundaries into extraction chunks.
+
+        Args:
+            text (str): Full transcript
+
+        Returns:
+            list: Chunk strings, each at most CHUNK_CHAR_BUDGET long
+        """
+        chunks = []
+        current = []
+        current_len = 0
+        for sentence in cached_split_sentences(text):
+            if current and current_len + len(sentence) > CHUNK_CHAR_BUDGET:
+                chunks.append(' '.join(current))
+                current = []
+                current_len = 0
+            current.append(sentence)
+            current_len += len(sentence) + 1
+        if current:
+            chunks.append(' '.join(current))
+        return chunks
+
+    async def _extract_chunk(self, chunk, transcript_info):
+        """Extract action items from one transcript chunk.
+
+        Args:
+            chunk (str): Transcript chunk
+            transcript_info (dict): Transcript metadata for the prompt
+
+        Returns:
+            ActionItemExtraction: Structured extraction for the chunk
+        """
+        return await self.async_client.chat.completions.create(
+            model="gpt-4-turbo-preview",
+            response_model=ActionItemExtraction,
+            temperature=0,
+            max_retries=2,
+            messages=[
+                {"role": "system", "content": self.system_prompt},
+                {"role": "user", "content": f"Transcript metadata: {json.dumps(transcript_info)}\n\n{chunk}"}
+            ]
+        )
+
+    def _chunked_extraction(self, text, transcript_info):
+        """Extract action items from a long transcript chunk-parallel.
+
+        The chunks are independent requests, so they are issued together
+        with asyncio.gather instead of sequentially; latency is one round
+        trip instead of one per chunk.
+
+        Args:
+            text (str): Full transcript
+            transcript_info (dict): Transcript metadata for the prompt
+
+        Returns:
+            dict: Merged extraction across all chunks
+        """
+        chunks = self._split_into_chunks(text)
+        logger.info(f"Extracting action items from {len(chunks)} chunks concurrently")
+
+        async def gather_all():
+            return await asyncio.gather(
+                *(self._extract_chunk(chunk, transcript_info) for chunk in chunks),
+                return_exceptions=True)
+
+        responses = asyncio.run(gather_all())
+
+        merged = {
+            'action_items': [],
+            'meeting_title': None,
+            'meeting_date': None,
+            'decisions': [],
+            'participants': [],
+            'extraction_summary': ''
+        }
+        seen_tasks = set()
+        failures = 0
+        for response in responses:
+            if isinstance(response, Exception):
+                logger.error(f"Chunk extraction failed: {response}")
+                failures += 1
+                continue
+            data = response.model_dump()
+            merged['meeting_title'] = merged['meeting_title'] or data.get('meeting_title')
+            merged['meeting_date'] = merged['meeting_date'] or data.get('meeting_date')
+            merged['decisions'].extend(data.get('decisions', []))
+            merged['participants'].extend(data.get('participants', []))
+            # Dedupe across chunk overlaps by task description
+            for item in data.get('action_items', []):
+                key = item.get('task_description', '').strip().lower()
+                if key and key not in seen_tasks:
+                    seen_tasks.add(key)
+                    merged['action_items'].append(item)
+
+        if failures == len(responses):
+            # Every chunk failed; fall back like the single-shot path does
+            return self._rule_based_extraction(text)
+
+        merged['extraction_summary'] = (
+            f"Extracted {len(merged['action_items'])} action items "
+            f"from {len(chunks)} chunks.")
+        return merged
+
     def _rule_based_extraction(self, text):
         """Extract action items using rule-based approach.
         
@@ -321,14 +473,41 @@ class ActionItemsService:
             dict: Dictionary with action items and related information
         """
         # Clean and tokenize text
-        clean_text = re.sub(r'\s+', ' ', text).strip()
-        sentences = sent_tokenize(clean_text)
+        clean_text = ' '.join(text.split())
+
+        # One whole-transcript scan before tokenizing: if no action
+        # indicator appears anywhere, skip sentence splitting and the
+        # per-sentence loop entirely (agendas and announcements hit this).
+        # ASCII transcripts scan as bytes, bypassing Unicode case folding
+        if clean_text.isascii():
+            hit = self._action_re_bytes.search(clean_text.encode('ascii'))
+        else:
+            hit = self._action_re.search(clean_text)
+        if not hit:
+            return {
+                'action_items': [],
+                'meeting_title': None,
+                'meeting_date': None,
+                'decisions': [],
+                'participants': [],
+                'extraction_summary': "Extracted 0 action items using rule-based approach."
+            }
+
+        sentences = cached_split_sentences(clean_text)
         
         action_items = []
         
         for sentence in sentences:
-            # Check if the sentence contains an action item indicator
-            if any(phrase in sentence.lower() for phrase in self.action_phrases):
+            # Lowercase once per sentence; a set intersection catches the
+            # common single-word indicators without running the full
+            # alternation scan
+            sl = sentence.lower()
+            if self._action_ac is not None:
+                has_action = next(self._action_ac.iter(sl), None) is not None
+            else:
+                has_action = bool(self._action_words.intersection(sl.split())
+                                  or self._action_re.search(sl))
+            if has_action:
                 # Extract the basic task
                 task = sentence
                 
@@ -336,7 +515,7 @@ class ActionItemsService:
                 assignee = self._extract_assignee(sentence)
                 
                 # Try to extract deadline
-                deadline = self._extract_deadline(sentence)
+                deadline = self._extract_deadline(sl)
                 
                 # Add to action items list
                 action_items.append({
@@ -359,25 +538,28 @@ class ActionItemsService:
             'extraction_summary': f"Extracted {len(action_items)} action items using rule-based approach."
         }
     
-    def _extract_deadline(self, sentence):
+    def _extract_deadline(self, sentence_lower):
         """Extract deadline from a sentence.
         
         Args:
-            sentence (str): Sentence to analyze
+            sentence_lower (str): Lowercased sentence to analyze
             
         Returns:
             str: Extracted deadline or None
         """
-        sentence = sentence.lower()
-        
-        for pattern in self.date_patterns:
-            match = re.search(pattern, sentence)
-            if match:
-                # Return the first capturing group or combine groups for dates
-                if len(match.groups()) > 1 and "January|February|March|April|May|June|July|August|September|October|November|December" in pattern:
-                    # For patterns with month and date
-                    return f"{match.group(1)} {match.group(2)}"
-                return match.group(1)
+        fused = self._deadline_re.search(sentence_lower)
+        if fused is None:
+            return None
+
+        # A pattern hit; re-run just that pattern to pick out its groups
+        cre = self._date_res[int(fused.lastgroup[1:])]
+        match = cre.search(sentence_lower)
+        if match:
+            # Return the first capturing group or combine groups for dates
+            if len(match.groups()) > 1 and _MONTHS in cre.pattern:
+                # For patterns with month and date
+                return f"{match.group(1)} {match.group(2)}"
+            return match.group(1)
         
         return None
     
@@ -390,8 +572,8 @@ class ActionItemsService:
         Returns:
             str: Extracted assignee or None
         """
-        for pattern in self.assignee_patterns:
-            match = re.search(pattern, sentence)
+        for cre in self._assignee_res:
+            match = cre.search(sentence)
             if match:
                 assignee = match.group(1).strip()
                 # Filter out common false positives
@@ -0,0 +1,91 @@
+import logging
+import re
+from functools import lru_cache
+
+import nltk
+
+from config import current_config as config
+from services._nltk_bootstrap import ensure_resources
+
+# Lightweight sentence boundary: end punctuation, whitespace, then an
+# uppercase start. Much coarser than Punkt but a single C-level scan
+_SENT_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def ensure_punkt():
+    """Make sure the Punkt sentence tokenizer data is on disk.
+
+    Only hits the network when the resource is missing, so calling this
+    repeatedly is cheap.
+    """
+    ensure_resources('tokenizers/punkt')
+
+
+@lru_cache(maxsize=8)
+def get_punkt(language='english'):
+    """Get a cached Punkt sentence tokenizer.
+
+    Building a PunktTokenizer means unpickling the trained model, which is
+    far too expensive to repeat per call; the cache makes repeated
+    tokenization hit an already-loaded instance.
+
+    Args:
+        language (str): Tokenizer language. Defaults to 'english'.
+
+    Returns:
+        PunktSentenceTokenizer: Loaded sentence tokenizer
+    """
+    ensure_punkt()
+    return nltk.data.load(f'tokenizers/punkt/{language}.pickle')
+
+
+def fast_sent_tokenize(text):
+    """Split text into sentences with a single regex scan.
+
+    Adequate for action item and sentiment segmentation, and far cheaper
+    than Punkt's Python-level state machine.
+
+    Args:
+        text (str): Text to split
+
+    Returns:
+        list: Sentences
+    """
+    return _SENT_RE.split(text)
+
+
+def split_sentences(text):
+    """Split text into sentences.
+
+    Uses the regex splitter when FAST_SPLITTER is enabled, otherwise the
+    cached Punkt tokenizer.
+
+    Args:
+        text (str): Text to split
+
+    Returns:
+        list: Sentences
+    """
+    if config.FAST_SPLITTER:
+        return fast_sent_tokenize(text)
+    return get_punkt().tokenize(text)
+
+
+@lru_cache(maxsize=128)
+def cached_split_sentences(text):
+    """Split text into sentences, memoizing on the exact text.
+
+    The same transcript typically flows through several services in one
+    pipeline run; caching means Punkt runs once per distinct text.
+
+    Args:
+        text (str): Text to split
+
+    Returns:
+        tuple: Sentences (immutable, so the cache entry can be shared)
+    """
+    return tuple(split_sentences(text))
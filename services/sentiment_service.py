@@ -1,21 +1,32 @@
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 import nltk
 from nltk.sentiment import SentimentIntensityAnalyzer
-from nltk.tokenize import sent_tokenize
+from services._nltk_bootstrap import ensure_resources
+from services.nlp_utils import cached_split_sentences
 from config import current_config as config
 
+# spaCy's rule-based sentencizer splits sentences much faster than Punkt on
+# long transcripts; fall back to NLTK when spaCy isn't installed
+try:
+    import spacy
+    SPACY_AVAILABLE = True
+except ImportError:
+    SPACY_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Only fan out per-sentence scoring on transcripts long enough for the
+# pool to pay for itself
+PARALLEL_THRESHOLD = 200
+
 # Download NLTK resources if not already downloaded
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('sentiment/vader_lexicon.zip')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('vader_lexicon')
+ensure_resources('tokenizers/punkt', 'sentiment/vader_lexicon.zip')
 
 class SentimentService:
     """Service for analyzing sentiment in text."""
@@ -28,7 +39,29 @@ class SentimentService:
         """
         self.model = model or config.SENTIMENT_MODEL
         self.analyzer = SentimentIntensityAnalyzer()
+        # Meeting transcripts repeat short utterances ("ok", "thanks", ...)
+        # constantly; memoizing makes repeats a dict hit instead of a full
+        # lexicon pass
+        self._score = lru_cache(maxsize=4096)(self.analyzer.polarity_scores)
+        self._sentencizer = None
+        if SPACY_AVAILABLE:
+            nlp = spacy.blank('en')
+            nlp.add_pipe('sentencizer')
+            self._sentencizer = nlp
         logger.info(f"Initialized sentiment analysis service with model: {self.model}")
+
+    def _split_sentences(self, text):
+        """Split text into sentences using the fastest available tokenizer.
+
+        Args:
+            text (str): Text to split
+
+        Returns:
+            list: Sentences
+        """
+        if self._sentencizer is not None:
+            return [sent.text for sent in self._sentencizer(text).sents]
+        return list(cached_split_sentences(text))
     
     def analyze_sentiment(self, text, by_speaker=None):
         """Analyze sentiment in text.
@@ -41,7 +74,10 @@ class SentimentService:
             dict: Sentiment analysis results
         """
         logger.info("Analyzing sentiment in text")
-        
+
+        # Bound memory per top-level call rather than across the process
+        self._score.cache_clear()
+
         try:
             if not text or len(text.strip()) == 0:
                 return {'error': 'No text provided for sentiment analysis', 'status': 'error'}
@@ -75,42 +111,42 @@ class SentimentService:
             list: Sentiment analysis results by segment
         """
         # Clean text
-        clean_text = re.sub(r'\s+', ' ', text).strip()
+        clean_text = ' '.join(text.split())
         
         # Get overall sentiment
-        overall_sentiment = self.analyzer.polarity_scores(clean_text)
+        overall_sentiment = self._score(clean_text)
         
-        # Split text into segments (sentences or paragraphs)
-        sentences = sent_tokenize(clean_text)
+        # Split into segments and drop very short sentences up front, so
+        # segment ids come out sequential and no scoring work is wasted
+        sentences = [s for s in self._split_sentences(clean_text)
+                     if s.count(' ') >= 2]
+
+        # Sentences are independent, so long transcripts score in parallel
+        if len(sentences) > PARALLEL_THRESHOLD:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+                scored = list(pool.map(self._score, sentences, chunksize=64))
+        else:
+            score = self._score
+            scored = [score(s) for s in sentences]
         
         # Analyze sentiment for each segment
-        results = []
-        
-        # Add overall sentiment
-        results.append({
+        results = [{
             'segment': 'overall',
             'text': clean_text[:100] + ('...' if len(clean_text) > 100 else ''),
             'score': overall_sentiment['compound'],
             'positive': overall_sentiment['pos'],
             'neutral': overall_sentiment['neu'],
             'negative': overall_sentiment['neg']
-        })
+        }]
         
-        # Add sentiment for each segment
-        for i, sentence in enumerate(sentences):
-            if len(sentence.split()) < 3:  # Skip very short sentences
-                continue
-                
-            sentiment = self.analyzer.polarity_scores(sentence)
-            
-            results.append({
-                'segment': f'segment_{i+1}',
-                'text': sentence,
-                'score': sentiment['compound'],
-                'positive': sentiment['pos'],
-                'neutral': sentiment['neu'],
-                'negative': sentiment['neg']
-            })
+        results.extend({
+            'segment': f'segment_{i+1}',
+            'text': sentence,
+            'score': sentiment['compound'],
+            'positive': sentiment['pos'],
+            'neutral': sentiment['neu'],
+            'negative': sentiment['neg']
+        } for i, (sentence, sentiment) in enumerate(zip(sentences, scored)))
         
         return results
     
@@ -126,11 +162,15 @@ class SentimentService:
         results = []
         
         for speaker, segments in by_speaker.items():
+            # Materialize once in case a generator was passed; the segments
+            # are iterated again below
+            segments = list(segments)
+
             # Combine all segments for this speaker
             speaker_text = ' '.join(segments)
             
             # Get overall sentiment for this speaker
-            speaker_sentiment = self.analyzer.polarity_scores(speaker_text)
+            speaker_sentiment = self._score(speaker_text)
             
             # Add to results
             results.append({
@@ -143,13 +183,15 @@ class SentimentService:
             })
             
             # Analyze individual segments for this speaker
+            score = self._score
+            append = results.append
             for i, segment in enumerate(segments):
-                if len(segment.split()) < 3:  # Skip very short segments
+                if segment.count(' ') < 2:  # Skip very short segments
                     continue
                     
-                segment_sentiment = self.analyzer.polarity_scores(segment)
+                segment_sentiment = score(segment)
                 
-                results.append({
+                append({
                     'speaker': speaker,
                     'segment': f'{speaker}_segment_{i+1}',
                     'text': segment,
@@ -1,11 +1,17 @@
+import asyncio
+import hashlib
 import logging
 import re
+import threading
+from collections import Counter, OrderedDict
 import nltk
-from nltk.tokenize import sent_tokenize
+from services._nltk_bootstrap import ensure_resources
+from services._openai_client import get_instructor_client, get_async_instructor_client
+from services.nlp_utils import split_sentences
 from nltk.corpus import stopwords
-from nltk.cluster.util import cosine_distance
 import numpy as np
-import networkx as nx
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
 from config import current_config as config
 from typing import List, Dict, Optional, Any, Union
 import json
@@ -20,17 +26,91 @@ try:
 except ImportError:
     INSTRUCTOR_AVAILABLE = False
 
+# orjson parses/serializes the nested summary structures several times
+# faster than the stdlib json; fall back silently when not installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Download NLTK resources if not already downloaded
-try:
-    nltk.data.find('tokenizers/punkt')
-    nltk.data.find('corpora/stopwords')
-except LookupError:
-    nltk.download('punkt')
-    nltk.download('stopwords')
+ensure_resources('tokenizers/punkt', 'corpora/stopwords')
+
+# Hoisted out of the per-call paths: stopwords.words() re-reads the corpus
+# file on every call, and inline re.findall re-checks the pattern cache
+_STOPWORDS = frozenset(stopwords.words('english'))
+_WORD_RE = re.compile(r'\w+')
+_WS_RE = re.compile(r'\s+')
+
+# Finished summaries keyed by transcript hash: different detail views of
+# the same meeting re-request the same text, and a hit skips a full
+# LLM round-trip (or TextRank run) for the cost of one blake2b pass
+_summary_cache = OrderedDict()
+_summary_cache_lock = threading.Lock()
+
+
+def _pagerank_numpy(sim, damping=0.85, tol=1e-6, max_iter=100):
+    """Run PageRank directly on a similarity matrix.
+
+    Going through networkx meant copying the matrix into a dict-of-dicts
+    graph and power-iterating in pure Python; this does the same power
+    iteration as a handful of NumPy matrix-vector products.
+
+    Args:
+        sim (numpy.ndarray): Square similarity matrix
+        damping (float): Damping factor. Defaults to 0.85.
+        tol (float): L1 convergence threshold. Defaults to 1e-6.
+        max_iter (int): Iteration cap. Defaults to 100.
+
+    Returns:
+        numpy.ndarray: PageRank score per row of the matrix
+    """
+    n = sim.shape[0]
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    # Row-normalize into a transition matrix; dangling rows (all zeros)
+    # keep a zero row, which the teleport term compensates for. float32
+    # halves the memory traffic of the iteration and is ample precision
+    # for ranking
+    if sparse.issparse(sim):
+        # Most sentence pairs share no content words, so the similarity
+        # matrix arrives CSR; the matvec then only touches real edges
+        row_sums = np.asarray(sim.sum(axis=1), dtype=np.float32).ravel()
+        inv = np.divide(1.0, row_sums, out=np.zeros_like(row_sums),
+                        where=row_sums > 0)
+        transition_t = sim.multiply(inv[:, None]).T.tocsr().astype(np.float32)
+    else:
+        # Dense fallback: materialize the transpose contiguously so each
+        # matvec streams through memory
+        sim = np.ascontiguousarray(sim, dtype=np.float32)
+        row_sums = sim.sum(axis=1, keepdims=True)
+        transition = np.divide(sim, row_sums, out=np.zeros_like(sim),
+                               where=row_sums > 0)
+        transition_t = np.ascontiguousarray(transition.T)
+
+    ranks = np.full(n, 1.0 / n, dtype=np.float32)
+    new_ranks = np.empty_like(ranks)
+    teleport = np.float32((1.0 - damping) / n)
+    damping = np.float32(damping)
+    for _ in range(max_iter):
+        # In-place matvec and update: no per-iteration allocations
+        if sparse.issparse(transition_t):
+            new_ranks[:] = transition_t @ ranks
+        else:
+            np.matmul(transition_t, ranks, out=new_ranks)
+        new_ranks *= damping
+        new_ranks += teleport
+        delta = np.abs(new_ranks - ranks).sum()
+        ranks, new_ranks = new_ranks, ranks
+        if delta < tol:
+            break
+    return ranks
 
 # Define data models for structured summarization
 if INSTRUCTOR_AVAILABLE:
@@ -83,7 +163,7 @@ class SummarizationService:
         # Check if we have OpenAI API key and instructor available
         if INSTRUCTOR_AVAILABLE and config.OPENAI_API_KEY:
             try:
-                self.openai_client = instructor.patch(OpenAI(api_key=config.OPENAI_API_KEY))
+                self.openai_client = get_instructor_client()
                 self.use_instructor = True
                 logger.info("Using OpenAI with instructor for enhanced summarization")
                 
@@ -152,14 +232,28 @@ class SummarizationService:
             if not text or len(text.strip()) == 0:
                 return {'error': 'No text provided for summarization', 'status': 'error'}
             
+            key = (hashlib.blake2b(text.encode(), digest_size=16).hexdigest(),
+                   self.model, max_sentences)
+            with _summary_cache_lock:
+                if key in _summary_cache:
+                    _summary_cache.move_to_end(key)
+                    logger.info("Summary cache hit")
+                    return _summary_cache[key]
+            
             # Choose summarization approach based on model and available capabilities
             if self.model == "ai_powered" and self.use_instructor:
-                return self._ai_powered_summarize(text)
-            elif self.model == "text_rank" or not self.use_instructor:
-                return self._text_rank_summarize_enhanced(text, max_sentences)
+                result = self._ai_powered_summarize(text)
             else:
                 # Default to text rank with enhanced capabilities
-                return self._text_rank_summarize_enhanced(text, max_sentences)
+                result = self._text_rank_summarize_enhanced(text, max_sentences)
+            
+            if result.get('status') == 'success':
+                with _summary_cache_lock:
+                    _summary_cache[key] = result
+                    _summary_cache.move_to_end(key)
+                    while len(_summary_cache) > config.SUMMARY_CACHE_SIZE:
+                        _summary_cache.popitem(last=False)
+            return result
             
         except Exception as e:
             logger.error(f"Error generating summary: {e}")
@@ -175,6 +269,11 @@ class SummarizationService:
             dict: Structured summary at multiple detail levels
         """
         try:
+            # Long transcripts go map-reduce: summarize chunks
+            # concurrently, then merge the partials in a final pass
+            if len(text) > config.MAP_REDUCE_THRESHOLD:
+                return self._map_reduce_summarize(text)
+
             # Use OpenAI with instructor for structured output
             response = self.openai_client.chat.completions.create(
                 model="gpt-3.5-turbo",  # Use an appropriate model that's available
@@ -187,8 +286,13 @@ class SummarizationService:
                 ]
             )
             
-            # Convert to dict for processing
-            summary_data = response.model_dump()
+            # Convert to dict for processing; round-tripping through
+            # orjson beats model_dump's Python-level traversal on the
+            # deeply nested Topic/Decision lists
+            if ORJSON_AVAILABLE:
+                summary_data = orjson.loads(response.model_dump_json())
+            else:
+                summary_data = response.model_dump()
             
             # Format for compatibility with the existing application
             result = {
@@ -213,6 +317,183 @@ class SummarizationService:
             # Fallback to Text Rank
             return self._text_rank_summarize_enhanced(text)
     
+    def submit_batch(self, transcripts):
+        """Submit a backlog of transcripts to the OpenAI Batch API.
+
+        Batch runs cost half the synchronous price and are completed
+        within 24 hours, which suits overnight processing of recorded
+        meetings that nobody is waiting on.
+
+        Args:
+            transcripts (dict): Mapping of transcript ID to transcript text
+
+        Returns:
+            str: Batch ID to pass to collect_batch, or an error dict when
+                no OpenAI client is configured
+        """
+        if not self.use_instructor:
+            return {'error': 'OpenAI client is not configured', 'status': 'error'}
+
+        dumps = orjson.dumps if ORJSON_AVAILABLE else json.dumps
+        lines = []
+        for tid, text in transcripts.items():
+            lines.append(dumps({
+                'custom_id': tid,
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': {
+                    'model': 'gpt-3.5-turbo',
+                    'temperature': 0,
+                    'messages': [
+                        {'role': 'system', 'content': self.system_prompt},
+                        {'role': 'user', 'content': text}
+                    ]
+                }
+            }))
+
+        payload = b'\n'.join(lines) if ORJSON_AVAILABLE else '\n'.join(lines).encode()
+        batch_file = self.openai_client.files.create(
+            file=('summaries.jsonl', payload), purpose='batch')
+        batch = self.openai_client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint='/v1/chat/completions',
+            completion_window='24h')
+        logger.info(f"Submitted summary batch {batch.id} with {len(lines)} transcripts")
+        return batch.id
+
+    def collect_batch(self, batch_id, poll_interval=60):
+        """Wait for a summary batch and collect its results.
+
+        Args:
+            batch_id (str): Batch ID returned by submit_batch
+            poll_interval (int): Seconds between status polls. Defaults to 60.
+
+        Returns:
+            dict: Mapping of transcript ID to result dict
+        """
+        if not self.use_instructor:
+            return {'error': 'OpenAI client is not configured', 'status': 'error'}
+
+        import time
+
+        while True:
+            batch = self.openai_client.batches.retrieve(batch_id)
+            if batch.status == 'completed':
+                break
+            if batch.status in ('failed', 'expired', 'cancelled'):
+                return {'error': f'Batch {batch_id} ended as {batch.status}',
+                        'status': 'error'}
+            time.sleep(poll_interval)
+
+        output = self.openai_client.files.content(batch.output_file_id)
+        results = {}
+        for line in output.text.splitlines():
+            if not line:
+                continue
+            entry = orjson.loads(line) if ORJSON_AVAILABLE else json.loads(line)
+            body = entry.get('response', {}).get('body', {})
+            choices = body.get('choices') or []
+            content = choices[0]['message']['content'] if choices else ''
+            results[entry.get('custom_id')] = {
+                'summary': content,
+                'status': 'success',
+                'model': self.model
+            }
+        return results
+
+    def _split_for_map_reduce(self, text):
+        """Split a transcript on sentence boundaries into summary chunks.
+
+        Args:
+            text (str): Full transcript
+
+        Returns:
+            list: Chunk strings, each at most MAP_REDUCE_THRESHOLD long
+        """
+        chunks = []
+        current = []
+        current_len = 0
+        for sentence in split_sentences(text):
+            if current and current_len + len(sentence) > config.MAP_REDUCE_THRESHOLD:
+                chunks.append(' '.join(current))
+                current = []
+                current_len = 0
+            current.append(sentence)
+            current_len += len(sentence) + 1
+        if current:
+            chunks.append(' '.join(current))
+        return chunks
+
+    async def _summarize_chunk(self, chunk, semaphore):
+        """Summarize one transcript chunk on the async client.
+
+        Args:
+            chunk (str): Chunk text
+            semaphore (asyncio.Semaphore): Concurrency bound
+
+        Returns:
+            MeetingSummary: Structured summary of the chunk
+        """
+        async with semaphore:
+            return await get_async_instructor_client().chat.completions.create(
+                model="gpt-3.5-turbo",
+                response_model=MeetingSummary,
+                temperature=0,
+                max_retries=2,
+                messages=[
+                    {"role": "system", "content": self.system_prompt},
+                    {"role": "user", "content": chunk}
+                ]
+            )
+
+    def _map_reduce_summarize(self, text):
+        """Summarize a long transcript as concurrent chunks plus a merge.
+
+        The chunk calls are independent LLM round-trips, so running them
+        under one event loop turns K sequential waits into roughly one.
+
+        Args:
+            text (str): Meeting transcript text
+
+        Returns:
+            dict: Structured summary at multiple detail levels
+        """
+        chunks = self._split_for_map_reduce(text)
+        logger.info(f"Map-reduce summarization over {len(chunks)} chunks")
+
+        async def gather_chunks():
+            semaphore = asyncio.Semaphore(config.MAX_CONCURRENCY)
+            return await asyncio.gather(
+                *(self._summarize_chunk(chunk, semaphore) for chunk in chunks),
+                return_exceptions=True)
+
+        partials = [p for p in asyncio.run(gather_chunks())
+                    if not isinstance(p, Exception)]
+        if not partials:
+            logger.error("All summary chunks failed, falling back to TextRank")
+            return self._text_rank_summarize_enhanced(text)
+
+        # Reduce: feed the partial minutes back through the single-shot
+        # path, which is far below the threshold by construction
+        digest = '\n\n'.join(
+            f"Part {i + 1}:\nTLDR: {p.tldr}\n{p.minutes}"
+            for i, p in enumerate(partials))
+        result = self._ai_powered_summarize(digest)
+
+        # Union the list fields the reduce pass may have compressed away
+        if result.get('status') == 'success':
+            for field in ('participants', 'decisions', 'next_steps',
+                          'notable_quotes'):
+                merged = []
+                for p in partials:
+                    for value in getattr(p, field, []):
+                        entry = value.model_dump() if hasattr(value, 'model_dump') else value
+                        if entry not in merged:
+                            merged.append(entry)
+                if merged:
+                    result[field] = merged
+        return result
+
     def _text_rank_summarize_enhanced(self, text, max_sentences=10):
         """Enhanced TextRank summarization with multi-level summary generation.
         
@@ -224,8 +505,8 @@ class SummarizationService:
             dict: Summary at different detail levels
         """
         # Clean and tokenize text
-        clean_text = re.sub(r'\s+', ' ', text).strip()
-        sentences = sent_tokenize(clean_text)
+        clean_text = _WS_RE.sub(' ', text).strip()
+        sentences = split_sentences(clean_text)
         
         # If we have very little text, just return it
         if len(sentences) <= max_sentences // 2:
@@ -238,26 +519,30 @@ class SummarizationService:
             }
         
         # Create similarity matrix
-        stop_words = set(stopwords.words('english'))
-        similarity_matrix = self._build_similarity_matrix(sentences, stop_words)
+        similarity_matrix = self._build_similarity_matrix(sentences, _STOPWORDS)
         
         # Apply PageRank algorithm to find important sentences
-        nx_graph = nx.from_numpy_array(similarity_matrix)
-        scores = nx.pagerank(nx_graph)
+        scores = _pagerank_numpy(similarity_matrix)
         
-        # Sort sentences by score
-        ranked_sentences = sorted([(scores[i], i, sentences[i]) for i in range(len(sentences))], 
-                                reverse=True)
+        # Partial top-K selection instead of a full sort: nothing below
+        # consumes more than max(10, max_sentences) ranked sentences
+        k = min(len(sentences), max(10, max_sentences))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        ranked_sentences = [(scores[i], i, sentences[i]) for i in top]
         
         # Generate TLDR (1-2 sentences)
         tldr_sentences = [ranked_sentences[i][2] for i in range(min(2, len(ranked_sentences)))]
         tldr = ' '.join(tldr_sentences)
         
-        # Generate key points (5-10 points)
+        # Generate key points (5-10 points); dedupe with a set so repeated
+        # short utterances don't trigger list scans per candidate
         key_points = []
+        seen = set()
         for i in range(min(10, len(ranked_sentences))):
             point = ranked_sentences[i][2]
-            if point not in key_points:  # Avoid duplicates
+            if point not in seen:  # Avoid duplicates
+                seen.add(point)
                 key_points.append(point)
         
         # Generate comprehensive summary (up to max_sentences)
@@ -305,35 +590,72 @@ class SummarizationService:
         current_topic_sentences = []
         current_topic_start = 0
         
+        # Tokenize every sentence exactly once up front. The two windows
+        # slide one sentence per step, so their vocabularies are kept in
+        # Counters updated incrementally: each sentence's tokens are added
+        # and removed a constant number of times overall, instead of the
+        # windows being re-unioned from scratch at every position.
+        # `shared` tracks how many distinct tokens the windows have in
+        # common, so overlap falls out without building any sets
+        token_sets = [frozenset(map(str.lower, _WORD_RE.findall(s))) - _STOPWORDS
+                      for s in sentences]
+        
+        window1 = Counter()
+        window2 = Counter()
+        shared = 0
+
+        def shift(window, other, tokens, delta):
+            nonlocal shared
+            if delta > 0:
+                for token in tokens:
+                    if window[token] == 0 and token in other:
+                        shared += 1
+                    window[token] += 1
+            else:
+                for token in tokens:
+                    window[token] -= 1
+                    if window[token] == 0:
+                        del window[token]
+                        if token in other:
+                            shared -= 1
+
+        for tokens in token_sets[:window_size]:
+            shift(window1, window2, tokens, 1)
+        for tokens in token_sets[window_size:window_size * 2]:
+            shift(window2, window1, tokens, 1)
+
         for i in range(len(sentences) - window_size):
-            # Calculate cohesion within current window
-            window1 = ' '.join(sentences[i:i+window_size])
-            window2 = ' '.join(sentences[i+window_size:i+window_size*2]) if i+window_size*2 <= len(sentences) else ''
-            
-            if not window2:
+            # Cohesion between the windows, skipped while the second
+            # window hangs past the end of the transcript
+            full = i + window_size * 2 <= len(sentences)
+            overlap = (shared / max(1, len(window1) + len(window2) - shared)
+                       if full else 1.0)
+
+            # Slide both windows one sentence for the next iteration; the
+            # boundary sentence migrates from the second window to the first
+            boundary = i + window_size
+            if boundary < len(sentences):
+                shift(window2, window1, token_sets[boundary], -1)
+                shift(window1, window2, token_sets[boundary], 1)
+            shift(window1, window2, token_sets[i], -1)
+            if i + window_size * 2 < len(sentences):
+                shift(window2, window1, token_sets[i + window_size * 2], 1)
+
+            if not full:
                 continue
-                
-            # Check if there's a significant change in vocabulary
-            # This is a simple heuristic; more sophisticated methods would be better
-            stop_words = set(stopwords.words('english'))
-            words1 = set([w.lower() for w in re.findall(r'\w+', window1) if w.lower() not in stop_words])
-            words2 = set([w.lower() for w in re.findall(r'\w+', window2) if w.lower() not in stop_words])
-            
-            overlap = len(words1.intersection(words2)) / max(1, len(words1.union(words2)))
-            
+
             # If low overlap, consider it a topic boundary
             if overlap < 0.3 and len(current_topic_sentences) >= 3:
                 # Create a topic from accumulated sentences
                 topic_text = ' '.join(current_topic_sentences)
                 
                 # Extract key sentences for this topic
-                topic_sentences = sent_tokenize(topic_text)
+                topic_sentences = split_sentences(topic_text)
                 if len(topic_sentences) > 2:
                     # Create a mini text rank for this segment
-                    similarity_matrix = self._build_similarity_matrix(topic_sentences, stop_words)
-                    nx_graph = nx.from_numpy_array(similarity_matrix)
+                    similarity_matrix = self._build_similarity_matrix(topic_sentences, _STOPWORDS)
                     try:
-                        scores = nx.pagerank(nx_graph)
+                        scores = _pagerank_numpy(similarity_matrix)
                         ranked_topic_sentences = sorted([(scores[i], topic_sentences[i]) for i in range(len(topic_sentences))], 
                                                      reverse=True)
                         
@@ -383,8 +705,7 @@ class SummarizationService:
             str: Generated title
         """
         # Remove stop words and keep only the important ones
-        stop_words = set(stopwords.words('english'))
-        words = [w for w in re.findall(r'\w+', sentence) if w.lower() not in stop_words]
+        words = [w for w in _WORD_RE.findall(sentence) if w.lower() not in _STOPWORDS]
         
         # Limit to 5-7 words
         if len(words) > 7:
@@ -401,52 +722,45 @@ class SummarizationService:
         return title
     
     def _build_similarity_matrix(self, sentences, stop_words):
-        """Build a similarity matrix for sentences.
+        """Build a cosine similarity matrix for sentences.
+        
+        One sparse binary term-sentence matrix and a single matrix product
+        replace the old pairwise Python loop, which re-tokenized and
+        rebuilt word vectors for every sentence pair.
         
         Args:
             sentences (list): List of sentences
             stop_words (set): Set of stop words to ignore
             
         Returns:
-            numpy.ndarray: Similarity matrix
+            scipy.sparse.csr_matrix: Similarity matrix (zero diagonal)
         """
-        # Create an empty similarity matrix
-        similarity_matrix = np.zeros((len(sentences), len(sentences)))
-        
-        for i in range(len(sentences)):
-            for j in range(len(sentences)):
-                if i != j:
-                    similarity_matrix[i][j] = self._sentence_similarity(
-                        sentences[i], sentences[j], stop_words)
-                    
+        # Tokenize each sentence once; the vectorizer just splits on
+        # whitespace since the filtering already happened here
+        docs = [' '.join(w for w in sentence.lower().split()
+                         if w not in stop_words)
+                for sentence in sentences]
+        
+        vectorizer = CountVectorizer(binary=True, tokenizer=str.split,
+                                     lowercase=False, token_pattern=None)
+        try:
+            matrix = vectorizer.fit_transform(docs).astype(np.float32)
+        except ValueError:
+            # Every sentence was stop words only
+            return sparse.csr_matrix((len(sentences), len(sentences)),
+                                     dtype=np.float32)
+        
+        # L2-normalized binary rows make M @ M.T exactly cosine similarity.
+        # The product stays sparse: most sentence pairs share no content
+        # words, so only real edges are stored or later walked by PageRank
+        norms = np.asarray(np.sqrt(matrix.multiply(matrix).sum(axis=1))).ravel()
+        norms[norms == 0] = 1.0
+        normalized = matrix.multiply(1.0 / norms[:, None]).tocsr()
+        
+        similarity_matrix = (normalized @ normalized.T).astype(np.float32)
+        similarity_matrix.setdiag(0.0)
+        similarity_matrix.eliminate_zeros()
         return similarity_matrix
-    
-    def _sentence_similarity(self, sent1, sent2, stop_words):
-        """Calculate the cosine similarity between two sentences.
-        
-        Args:
-            sent1 (str): First sentence
-            sent2 (str): Second sentence
-            stop_words (set): Set of stop words to ignore
-            
-        Returns:
-            float: Similarity score
-        """
-        words1 = [word.lower() for word in sent1.split() if word.lower() not in stop_words]
-        words2 = [word.lower() for word in sent2.split() if word.lower() not in stop_words]
-        
-        # Create a set of all unique words
-        all_words = list(set(words1 + words2))
-        
-        # Create word vectors
-        vector1 = [1 if word in words1 else 0 for word in all_words]
-        vector2 = [1 if word in words2 else 0 for word in all_words]
-        
-        # Calculate cosine similarity
-        if sum(vector1) > 0 and sum(vector2) > 0:
-            return 1 - cosine_distance(vector1, vector2)
-        else:
-            return 0
 
 # Create a default instance
 summarization_service = SummarizationService()
\ No newline at end of file
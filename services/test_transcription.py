@@ -1,37 +1,75 @@
 #!/usr/bin/env python3
+import argparse
 import os
 import sys
-from services.transcription_service import TranscriptionService
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from services.transcription_service import transcription_service
+
+
+def collect_files(paths):
+    """Expand the given paths into a flat list of audio files.
+
+    Args:
+        paths (list): File and/or directory paths
+
+    Returns:
+        list: Audio file paths, directories expanded one level
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if os.path.isfile(os.path.join(path, name))))
+        else:
+            files.append(path)
+    return files
+
 
 def test_transcription(file_path):
     """Test the transcription service with a given file."""
-    
-    print(f"Testing transcription of: {file_path}")
-    
+
     if not os.path.exists(file_path):
-        print(f"ERROR: File not found at {file_path}")
-        return
-    
-    # Create transcription service
-    service = TranscriptionService()
-    
-    # Try to transcribe the file
-    print("Starting transcription...")
-    result = service.transcribe_file(file_path)
-    
-    # Print the result
-    print("\nTranscription Result:")
-    print(f"Status: {result.get('status', 'Unknown')}")
-    
-    if result.get('status') == 'success':
-        print(f"\nTranscribed Text:\n{result.get('text', 'No text found')}")
-    else:
-        print(f"Error: {result.get('error', 'Unknown error')}")
+        return file_path, {'error': 'File not found', 'status': 'error'}
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python test_transcription.py <path_to_audio_file>")
+    result = transcription_service.transcribe_file(file_path)
+    return file_path, result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Transcribe one or more audio files")
+    parser.add_argument('paths', nargs='+',
+                        help="Audio files or directories of audio files")
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="Parallel transcriptions (default: 8)")
+    args = parser.parse_args()
+
+    files = collect_files(args.paths)
+    if not files:
+        print("No files to transcribe")
         sys.exit(1)
-    
-    file_path = sys.argv[1]
-    test_transcription(file_path)
\ No newline at end of file
+
+    print(f"Transcribing {len(files)} file(s) with "
+          f"concurrency {args.concurrency}...")
+
+    # The work is network-bound, so threads overlap the API round-trips
+    failures = 0
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        futures = [pool.submit(test_transcription, path) for path in files]
+        for future in as_completed(futures):
+            file_path, result = future.result()
+            print(f"\n=== {file_path} ===")
+            print(f"Status: {result.get('status', 'Unknown')}")
+            if result.get('status') == 'success':
+                print(f"Transcribed Text:\n{result.get('text', 'No text found')}")
+            else:
+                print(f"Error: {result.get('error', 'Unknown error')}")
+                failures += 1
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,135 @@
+import hashlib
+import io
+import json
 import os
 import logging
-import speech_recognition as sr
-from pydub import AudioSegment
-import tempfile
+import random
+import time
+from functools import cache
+from pathlib import PurePath
+import threading
 import subprocess
 import json
+from concurrent.futures import ThreadPoolExecutor
 from config import current_config as config
-from openai import OpenAI
+from openai import OpenAI, APIStatusError
+
+# Local INT8 inference is optional; without it the API backend is used
+try:
+    from faster_whisper import WhisperModel, BatchedInferencePipeline
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging configuration is the application's job; the module only logs
 logger = logging.getLogger(__name__)
 
+# Long recordings are split into windows and transcribed in parallel instead
+# of as one monolithic request; windows overlap slightly so words on a cut
+# boundary aren't lost
+CHUNK_LENGTH_MS = 30 * 1000
+CHUNK_OVERLAP_MS = 1000
+# Cuts are pulled back to the quietest gap in the last 5s of each window
+# so words are not sliced mid-utterance
+MIN_CHUNK_MS = 25 * 1000
+LONG_FILE_THRESHOLD_MS = 2 * CHUNK_LENGTH_MS
+CHUNK_WORKERS = int(os.getenv('CHUNK_WORKERS', '4'))
+
+# Compressed formats the Whisper API ingests directly: uploading the
+# original is far smaller than a decoded WAV, so files in these formats
+# skip the decode entirely when nothing needs streamed segments. WAV/PCM
+# inputs are excluded — those shrink when downmixed first
+_WHISPER_NATIVE = frozenset({'.mp3', '.mp4', '.mpeg', '.mpga', '.m4a', '.webm'})
+_PASSTHROUGH_MAX_BYTES = int(os.getenv('PASSTHROUGH_MAX_BYTES', 8 * 1024 * 1024))
+
+# Live stream buffers carry headerless PCM in this fixed format (the
+# socket layer's silence gate makes the same assumption)
+STREAM_FRAME_RATE = 16000
+STREAM_SAMPLE_WIDTH = 2
+STREAM_CHANNELS = 1
+
+# Finished transcriptions are spooled here keyed by (file digest, model),
+# so re-running the same recording skips the API entirely. The entry cap
+# keeps the directory bounded: past it, the oldest entries (by mtime) are
+# evicted on write
+CACHE_DIR = os.getenv('WHISPER_CACHE_DIR', '.whisper_cache')
+_CACHE_MAX_ENTRIES = int(os.getenv('WHISPER_CACHE_MAX_ENTRIES', '512'))
+_cache_lock = threading.Lock()
+
+# Configuration model settings map to Whisper API model names; the API
+# currently only exposes one model, but the aliases stay for future options
+_MODEL_ALIASES = {
+    'whisper-small': 'whisper-1',
+    'whisper-medium': 'whisper-1',
+    'whisper-large': 'whisper-1',
+    'default': 'whisper-1'
+}
+
+# Transient 429/5xx responses are retried with capped exponential
+# backoff and full jitter; other statuses surface immediately. The
+# semaphore bounds simultaneous Whisper calls across the chunk pool so
+# parallel windows don't burst past the account rate limit
+_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+_MAX_ATTEMPTS = 5
+_BACKOFF_CAP = 30.0
+_api_slots = threading.BoundedSemaphore(int(os.getenv('WHISPER_CONCURRENCY', '8')))
+
+# One OpenAI client per process: each construction builds a fresh httpx
+# pool and TLS context, and sharing keeps connections warm across calls
+_client = None
+_client_lock = threading.Lock()
+
+
+@cache
+def _pydub():
+    """Import pydub on first use.
+
+    pydub probes for ffmpeg/avlib on import, which is a noticeable slice
+    of cold start for callers that import this module without ever
+    decoding audio.
+
+    Returns:
+        tuple: (AudioSegment, detect_silence)
+    """
+    from pydub import AudioSegment
+    from pydub.silence import detect_silence
+    return AudioSegment, detect_silence
+
+
+def _looks_like_container(data):
+    """Check whether audio bytes start with a known container signature.
+
+    Covers every allowed upload format: WAV/RIFF, Ogg, WebM/Matroska
+    (EBML), MP4/M4A (ftyp box) and MP3 (ID3 tag or bare frame sync).
+    Anything else is treated as headerless PCM from the live stream.
+
+    Args:
+        data (bytes): Leading audio bytes
+
+    Returns:
+        bool: True if the bytes look like a container'd/encoded file
+    """
+    head = data[:12]
+    if head[:4] in (b'RIFF', b'OggS', b'fLaC') or head[:3] == b'ID3':
+        return True
+    if head[:4] == b'\x1aE\xdf\xa3':  # EBML (WebM/Matroska)
+        return True
+    if head[4:8] == b'ftyp':  # MP4/M4A
+        return True
+    # MPEG audio frame sync: 11 set bits
+    if len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0:
+        return True
+    return False
+
+
+def _get_client():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OpenAI(api_key=config.OPENAI_API_KEY)
+    return _client
+
 class TranscriptionService:
     """Service for transcribing audio to text using OpenAI's Whisper"""
     
@@ -22,192 +140,523 @@ class TranscriptionService:
             model (str, optional): Model to use for transcription. Defaults to None.
         """
         self.model = model or config.TRANSCRIPTION_MODEL
-        self.client = OpenAI(api_key=config.OPENAI_API_KEY)
+        self.client = _get_client()
+
+        # Local backend: quantized faster-whisper on the CPU, loaded once.
+        # Runs at several times real time with no network in the loop
+        self._local_pipeline = None
+        backend = config.TRANSCRIPTION_BACKEND
+        if backend == 'local':
+            if FASTER_WHISPER_AVAILABLE:
+                local_model = WhisperModel('small', device='cpu',
+                                           compute_type='int8')
+                self._local_pipeline = BatchedInferencePipeline(model=local_model)
+                logger.info("Using local faster-whisper INT8 backend")
+            else:
+                logger.warning("TRANSCRIPTION_BACKEND=local but faster-whisper "
+                               "is not installed, using the API backend")
+        self._warm = threading.Event()
         logger.info(f"Initialized transcription service with model: {self.model}")
+
+    def _warmup(self):
+        """Warm the backend off the request path.
+
+        For the API backend this forces DNS/TLS and pool setup with one
+        cheap request; for the local backend it runs a dummy second of
+        silence through the model so weights and kernels are resident.
+        Best effort: failures only mean the first real call pays the cost.
+        """
+        try:
+            if self._local_pipeline is not None:
+                AudioSegment, _ = _pydub()
+                buf = self._to_wav_buffer(
+                    AudioSegment.silent(duration=1000, frame_rate=16000))
+                self._local_pipeline.transcribe(buf, batch_size=1)
+            else:
+                self.client.models.list()
+        except Exception as e:
+            logger.debug("Warmup failed: %s", e)
+        finally:
+            self._warm.set()
     
-    def transcribe_file(self, file_path):
+    def transcribe_file(self, file_path, segment_callback=None, use_cache=True):
         """Transcribe an audio file.
-        
+
         Args:
             file_path (str): Path to the audio file
-            
+            segment_callback (callable, optional): Called with the text of
+                each finished window when the file is transcribed in chunks,
+                so callers can stream partial results. Defaults to None.
+            use_cache (bool): Consult and populate the on-disk result
+                cache. Callers transcribing ephemeral inputs (live-stream
+                chunks) should pass False so every few-hundred-ms chunk
+                doesn't become a permanent cache file. Defaults to True.
+
         Returns:
             dict: Transcription result with text and metadata
         """
-        logger.info(f"Transcribing file: {file_path}")
-        print(f"DEBUG: Attempting to transcribe file: {file_path}")
+        logger.info("Transcribing file: %s", file_path)
         
-        # Check if file exists
-        if not os.path.exists(file_path):
-            logger.error(f"File not found: {file_path}")
-            print(f"ERROR: File not found at {file_path}")
+        # One stat answers both the existence and the size check, instead
+        # of separate exists/getsize syscalls
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            logger.error("File not found: %s", file_path)
             return {'error': 'File not found', 'status': 'error'}
+        if st.st_size < 100:  # Very small files are likely empty/corrupt
+            logger.warning("File too small (%d bytes), possibly empty audio", st.st_size)
+            return {'error': 'Audio file too small or empty', 'status': 'error'}
         
+        # Hashing the file is orders of magnitude cheaper than the API
+        # call, so repeated runs on the same recording return immediately
+        whisper_model = self._get_whisper_model()
+        digest = None
+        if use_cache:
+            digest = self._file_digest(file_path)
+            cached = self._cache_get(digest, whisper_model)
+            if cached is not None:
+                logger.info("Transcription cache hit")
+                return cached
+        
+        # Compact native formats go up as-is: no decode, no WAV inflation
+        if (segment_callback is None
+                and st.st_size <= _PASSTHROUGH_MAX_BYTES
+                and PurePath(file_path).suffix.lower() in _WHISPER_NATIVE):
+            try:
+                with open(file_path, 'rb') as audio_file:
+                    response = self._call_whisper(audio_file, whisper_model)
+                result = {
+                    'text': response if response else "",
+                    'status': 'success',
+                    'model': whisper_model
+                }
+                if use_cache:
+                    self._cache_put(digest, whisper_model, result)
+                return result
+            except Exception as e:
+                # Fall through to the decode path; some containers carry
+                # codecs the API rejects even with a native extension
+                logger.warning(f"Native-format upload failed, decoding instead: {e}")
+
         try:
-            # Always convert to MP3 format for better Whisper compatibility
-            logger.info(f"Converting audio to MP3 format for processing")
+            # Decode once and keep everything in memory: Whisper only needs
+            # 16kHz mono PCM, so the old temp-file MP3 re-encode (plus the
+            # disk round-trip to reopen it) was pure overhead
             try:
-                # First attempt: Use pydub
+                AudioSegment, _ = _pydub()
                 audio = AudioSegment.from_file(file_path)
-                
-                # Create a temporary MP3 file
-                with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
-                    temp_path = temp_file.name
-                
-                audio.export(temp_path, format='mp3')
-                
             except Exception as e:
                 logger.warning(f"Pydub conversion failed: {e}. Trying ffmpeg directly.")
-                
-                # Second attempt: Use ffmpeg directly
-                try:
-                    # Create a temporary MP3 file
-                    with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
-                        temp_path = temp_file.name
-                    
-                    # Run ffmpeg to convert the file
-                    ffmpeg_cmd = [
-                        'ffmpeg', '-i', file_path, 
-                        '-ac', '1',  # Convert to mono
-                        '-ar', '16000',  # 16kHz sample rate
-                        '-c:a', 'libmp3lame',  # MP3 codec
-                        '-q:a', '4',  # Quality setting
-                        temp_path
-                    ]
-                    
-                    result = subprocess.run(
-                        ffmpeg_cmd, 
-                        capture_output=True, 
-                        text=True
-                    )
-                    
-                    if result.returncode != 0:
-                        logger.error(f"FFmpeg conversion failed: {result.stderr}")
-                        # If conversion fails, try using the original file
-                        temp_path = file_path
-                    
-                except Exception as ffmpeg_error:
-                    logger.error(f"FFmpeg direct conversion failed: {ffmpeg_error}")
-                    # If all conversions fail, use the original file
-                    temp_path = file_path
-
-            # Verify the file exists
-            if not os.path.exists(temp_path):
-                logger.error(f"Converted file not found: {temp_path}")
-                return {'error': 'Converted file not found', 'status': 'error'}
-                
-            # Check file size - Whisper needs at least some content
-            file_size = os.path.getsize(temp_path)
-            if file_size < 100:  # Very small files are likely empty/corrupt
-                logger.warning(f"File too small ({file_size} bytes), possibly empty audio")
-                return {'error': 'Audio file too small or empty', 'status': 'error'}
+                audio = None
 
-            whisper_model = self._get_whisper_model()
-            
-            # Perform transcription
-            with open(temp_path, "rb") as audio_file:
-                try:
-                    response = self.client.audio.transcriptions.create(
+            if audio is not None:
+                # Long recordings go through the chunked parallel path
+                if len(audio) > LONG_FILE_THRESHOLD_MS:
+                    result = self._transcribe_long_audio(audio, segment_callback)
+                    if use_cache and result.get('status') == 'success':
+                        self._cache_put(digest, whisper_model, result)
+                    return result
+                buf = self._to_wav_buffer(audio)
+            else:
+                # Fallback: a single ffmpeg pipe for formats pydub chokes
+                # on, straight to memory with no temp file
+                buf = self._ffmpeg_to_wav_bytes(file_path)
+                if buf is None:
+                    return {'error': 'Could not decode audio file', 'status': 'error'}
+
+            # Perform transcription straight from the in-memory buffer
+            response = self._call_whisper(('audio.wav', buf, 'audio/wav'),
+                                          whisper_model)
+
+            logger.info("Transcription completed successfully")
+
+            result = {
+                'text': response if response else "",
+                'status': 'success',
+                'model': whisper_model
+            }
+            if use_cache:
+                self._cache_put(digest, whisper_model, result)
+            return result
+
+        except Exception as e:
+            logger.error(f"Error transcribing audio: {e}")
+            return {'error': f'Error transcribing audio: {e}', 'status': 'error'}
+
+    def _ffmpeg_to_wav_bytes(self, file_path):
+        """Decode a file to 16kHz mono WAV bytes through one ffmpeg pipe.
+
+        Args:
+            file_path (str): Path to the audio file
+
+        Returns:
+            io.BytesIO: WAV bytes, or None when ffmpeg cannot decode it
+        """
+        proc = subprocess.Popen(
+            ['ffmpeg', '-i', file_path,
+             '-ac', '1', '-ar', '16000', '-f', 'wav', '-'],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        data, _ = proc.communicate()
+        if proc.returncode != 0 or not data:
+            logger.error(f"FFmpeg pipe decode failed for {file_path}")
+            return None
+        buf = io.BytesIO(data)
+        buf.name = 'audio.wav'
+        return buf
+
+    def _file_digest(self, file_path):
+        """Hash a file's content in bounded memory.
+
+        Args:
+            file_path (str): Path to the file
+
+        Returns:
+            str: Hex digest of the file content
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _cache_path(self, digest, whisper_model):
+        return os.path.join(CACHE_DIR, f"{digest}-{whisper_model}.json")
+
+    def _cache_get(self, digest, whisper_model):
+        """Read a cached transcription result, or None."""
+        path = self._cache_path(digest, whisper_model)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Refresh the mtime so eviction approximates LRU rather than FIFO
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return result
+
+    def _cache_put(self, digest, whisper_model, result):
+        """Spool a finished transcription result to the cache."""
+        try:
+            with _cache_lock:
+                os.makedirs(CACHE_DIR, exist_ok=True)
+                with open(self._cache_path(digest, whisper_model), 'w') as f:
+                    json.dump(result, f)
+                self._prune_cache()
+        except OSError as e:
+            logger.error(f"Could not cache transcription: {e}")
+
+    def _prune_cache(self):
+        """Evict the oldest cache entries once the cap is exceeded.
+
+        Caller must hold the cache lock. Eviction is by mtime, which reads
+        refresh, so the entries that have gone unused the longest go first.
+        """
+        entries = []
+        with os.scandir(CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.endswith('.json'):
+                    entries.append((entry.stat().st_mtime, entry.path))
+        if len(entries) <= _CACHE_MAX_ENTRIES:
+            return
+        entries.sort()
+        for _, path in entries[:len(entries) - _CACHE_MAX_ENTRIES]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _to_wav_buffer(self, audio):
+        """Render decoded audio to an in-memory 16kHz mono WAV.
+
+        Args:
+            audio (AudioSegment): Decoded audio
+
+        Returns:
+            io.BytesIO: WAV bytes, named so the SDK infers the mimetype
+        """
+        buf = io.BytesIO()
+        audio.set_frame_rate(16000).set_channels(1).set_sample_width(2) \
+             .export(buf, format='wav')
+        buf.seek(0)
+        buf.name = 'audio.wav'
+        return buf
+
+    def _transcribe_long_audio(self, audio, segment_callback=None):
+        """Transcribe a long recording as overlapping windows in parallel.
+
+        Args:
+            audio (AudioSegment): Decoded audio
+            segment_callback (callable, optional): Called with each window's
+                text, in order, as soon as it is available. Defaults to None.
+
+        Returns:
+            dict: Transcription result with text and metadata
+        """
+        whisper_model = self._get_whisper_model()
+
+        segments = self._split_on_silence(audio)
+
+        logger.info("Transcribing long audio as %d windows", len(segments))
+
+        try:
+            texts = []
+            with ThreadPoolExecutor(max_workers=CHUNK_WORKERS) as pool:
+                futures = [pool.submit(self._transcribe_segment, seg, whisper_model)
+                           for seg in segments]
+                # Collect in submission order so the stitched transcript and
+                # any streamed partials stay in document order
+                for future in futures:
+                    text = future.result()
+                    texts.append(text)
+                    if segment_callback is not None and text:
+                        segment_callback(text)
+
+            return {
+                'text': ' '.join(t for t in texts if t),
+                'status': 'success',
+                'model': whisper_model
+            }
+
+        except Exception as e:
+            logger.error(f"Error transcribing chunked audio: {e}")
+            return {'error': f'Error transcribing audio: {e}', 'status': 'error'}
+
+    def _call_whisper(self, file, whisper_model):
+        """Call the transcription endpoint with bounded, retried access.
+
+        Args:
+            file: File object or (name, stream, content-type) tuple
+            whisper_model (str): Whisper model name
+
+        Returns:
+            str: Transcribed text
+        """
+        stream = file[1] if isinstance(file, tuple) else file
+        if self._local_pipeline is not None:
+            segments, _ = self._local_pipeline.transcribe(stream, batch_size=16)
+            return ' '.join(seg.text.strip() for seg in segments)
+        for attempt in range(_MAX_ATTEMPTS):
+            try:
+                with _api_slots:
+                    return self.client.audio.transcriptions.create(
                         model=whisper_model,
-                        file=audio_file,
+                        file=file,
                         response_format="text"
                     )
-                    
-                    logger.info("Transcription completed successfully")
-                    
-                    # Clean up temporary file if created
-                    if temp_path != file_path and os.path.exists(temp_path):
-                        os.unlink(temp_path)
-                    
-                    # Make sure we have text content
-                    text = response if response else ""
-                    
-                    return {
-                        'text': text,
-                        'status': 'success',
-                        'model': whisper_model
-                    }
-                except Exception as transcription_error:
-                    logger.error(f"Error in Whisper API call: {transcription_error}")
-                    
-                    # Try one more fallback - convert to WAV format
-                    try:
-                        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as wav_temp:
-                            wav_path = wav_temp.name
-                        
-                        # Run ffmpeg to convert to WAV
-                        ffmpeg_cmd = [
-                            'ffmpeg', '-i', temp_path if temp_path != file_path else file_path,
-                            '-ac', '1',  # Convert to mono
-                            '-ar', '16000',  # 16kHz sample rate
-                            wav_path
-                        ]
-                        
-                        result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
-                        
-                        if result.returncode == 0:
-                            # Try Whisper API again with WAV
-                            with open(wav_path, "rb") as wav_file:
-                                response = self.client.audio.transcriptions.create(
-                                    model=whisper_model,
-                                    file=wav_file,
-                                    response_format="text"
-                                )
-                                
-                                logger.info("Transcription with WAV completed successfully")
-                                
-                                # Clean up temporary files
-                                if temp_path != file_path and os.path.exists(temp_path):
-                                    os.unlink(temp_path)
-                                if os.path.exists(wav_path):
-                                    os.unlink(wav_path)
-                                
-                                return {
-                                    'text': response if response else "",
-                                    'status': 'success',
-                                    'model': whisper_model
-                                }
-                        else:
-                            logger.error(f"WAV conversion failed: {result.stderr}")
-                            raise Exception(f"WAV conversion failed: {result.stderr}")
-                    
-                    except Exception as wav_error:
-                        logger.error(f"WAV fallback failed: {wav_error}")
-                        # Clean up temporary files
-                        if temp_path != file_path and os.path.exists(temp_path):
-                            os.unlink(temp_path)
-                        if 'wav_path' in locals() and os.path.exists(wav_path):
-                            os.unlink(wav_path)
-                        
-                        # Re-raise the original error
-                        raise transcription_error
-                
+            except APIStatusError as e:
+                status = getattr(e, 'status_code', None)
+                if status not in _RETRY_STATUS or attempt == _MAX_ATTEMPTS - 1:
+                    raise
+                delay = random.uniform(0, min(_BACKOFF_CAP, 2.0 ** attempt))
+                logger.warning("Whisper returned %s, retrying in %.1fs", status, delay)
+                time.sleep(delay)
+                if stream.seekable():
+                    stream.seek(0)
+
+    def _split_on_silence(self, audio):
+        """Cut long audio into ~30s windows, preferring silent cut points.
+
+        Fixed-interval cuts regularly land mid-word, which garbles the
+        text on both sides of the boundary. Each cut is instead placed in
+        a detected silence within the last 5s of the window; only when no
+        silence exists does the cut fall back to the fixed boundary with
+        a small overlap to protect the split word.
+
+        Args:
+            audio (AudioSegment): Decoded audio
+
+        Returns:
+            list: AudioSegment windows covering the recording in order
+        """
+        _, detect_silence = _pydub()
+        segments = []
+        start = 0
+        total = len(audio)
+        while total - start > CHUNK_LENGTH_MS:
+            tail = audio[start + MIN_CHUNK_MS:start + CHUNK_LENGTH_MS]
+            silences = detect_silence(tail, min_silence_len=300,
+                                      silence_thresh=tail.dBFS - 16)
+            if silences:
+                # Cut in the middle of the last silent stretch
+                s, e = silences[-1]
+                cut = start + MIN_CHUNK_MS + (s + e) // 2
+                segments.append(audio[start:cut])
+                start = cut
+            else:
+                # No usable silence: fixed cut, overlapped so the split
+                # word appears whole in one of the two windows
+                cut = start + CHUNK_LENGTH_MS
+                segments.append(audio[start:cut])
+                start = cut - CHUNK_OVERLAP_MS
+        segments.append(audio[start:])
+        return segments
+
+    def _transcribe_segment(self, segment, whisper_model):
+        """Transcribe a single audio window.
+
+        Args:
+            segment (AudioSegment): Audio window to transcribe
+            whisper_model (str): Whisper model name
+
+        Returns:
+            str: Transcribed text for the window
+        """
+        buf = self._to_wav_buffer(segment)
+        response = self._call_whisper(('audio.wav', buf, 'audio/wav'),
+                                      whisper_model)
+        return (response or "").strip()
+
+    def transcribe_bytes(self, audio_bytes):
+        """Transcribe raw audio bytes without touching disk.
+
+        Args:
+            audio_bytes (bytes): Encoded or PCM audio data
+
+        Returns:
+            dict: Transcription result with text and metadata
+        """
+        try:
+            AudioSegment, _ = _pydub()
+            if _looks_like_container(audio_bytes):
+                audio = AudioSegment.from_file(io.BytesIO(audio_bytes))
+            else:
+                # Headerless PCM from the live stream; ffmpeg's probe can't
+                # identify it, so decode with the stream's fixed parameters
+                audio = AudioSegment(data=audio_bytes,
+                                     sample_width=STREAM_SAMPLE_WIDTH,
+                                     frame_rate=STREAM_FRAME_RATE,
+                                     channels=STREAM_CHANNELS)
+            buf = self._to_wav_buffer(audio)
+
+            whisper_model = self._get_whisper_model()
+            response = self._call_whisper(('audio.wav', buf, 'audio/wav'),
+                                          whisper_model)
+            return {
+                'text': response if response else "",
+                'status': 'success',
+                'model': whisper_model
+            }
+
         except Exception as e:
-            logger.error(f"Error transcribing audio: {e}")
-            
-            # Clean up any temporary files
-            if 'temp_path' in locals() and temp_path != file_path and os.path.exists(temp_path):
-                os.unlink(temp_path)
-            if 'wav_path' in locals() and os.path.exists(wav_path):
-                os.unlink(wav_path)
-                
-            return {'error': f'Error transcribing audio: {e}', 'status': 'error'}
-    
+            logger.error("Error transcribing audio bytes: %s", e)
+            return {'error': f'Error transcribing audio chunk: {e}', 'status': 'error'}
+
+    def transcribe_chunk(self, audio_chunk):
+        """Transcribe a single chunk of audio data.
+
+        Args:
+            audio_chunk (bytes): Raw audio data for the chunk
+
+        Returns:
+            dict: Transcription result with text and metadata
+        """
+        return self.transcribe_bytes(audio_chunk)
+
+    def transcribe_batch(self, audio_chunks):
+        """Transcribe a batch of audio buffers in one pass.
+
+        The OpenAI API has no batch dimension, so this amortizes overhead by
+        keeping the per-buffer handling in one place for the batch worker.
+
+        Args:
+            audio_chunks (list): List of raw audio buffers
+
+        Returns:
+            list: Transcription result dict for each buffer, in order
+        """
+        return [self.transcribe_chunk(chunk) for chunk in audio_chunks]
+
     def _get_whisper_model(self):
         """Get the appropriate Whisper model based on configuration.
         
         Returns:
             str: Whisper model name
         """
-        # Map configuration model settings to Whisper model names
-        model_mapping = {
-            'whisper-small': 'whisper-1',   # Use the latest Whisper model
-            'whisper-medium': 'whisper-1',  # OpenAI API currently only exposes one model
-            'whisper-large': 'whisper-1',   # but we keep the mapping for future options
-            'default': 'whisper-1'
-        }
+        if self._local_pipeline is not None:
+            return 'faster-whisper-int8'
+        return _MODEL_ALIASES.get(self.model, 'whisper-1')
+
+class StreamingTranscriber:
+    """Rolling-buffer streaming transcription with LocalAgreement-2.
+
+    Live streams re-transcribe a growing audio buffer and treat the word
+    prefix that two consecutive hypotheses agree on as stable. Keeping
+    that update loop here (rather than in the socket layer) lets any
+    caller stream partials without reimplementing the agreement logic.
+    """
+
+    def __init__(self, service):
+        """Initialize the streaming state.
+
+        Args:
+            service (TranscriptionService): Service used for transcription
+        """
+        self._service = service
+        self.buffer = bytearray()
+        self._prev_words = []
+        self._committed = 0
+
+    def push(self, data):
+        """Append raw audio to the rolling buffer.
+
+        Args:
+            data (bytes): Raw PCM audio
+        """
+        self.buffer += data
+
+    def advance(self, commit_all=False):
+        """Re-transcribe the buffer and split stable from unstable words.
+
+        Args:
+            commit_all (bool): Commit the full hypothesis and reset the
+                buffer (utterance boundary or stream end)
+
+        Returns:
+            dict: {'status': 'success', 'committed': str, 'pending': str}
+                where committed is newly stable text and pending the
+                still-changing tail, or an error dict on failure
+        """
+        if not self.buffer:
+            return {'status': 'success', 'committed': '', 'pending': ''}
+
+        result = self._service.transcribe_chunk(bytes(self.buffer))
+        if result['status'] != 'success':
+            return result
+
+        words = result.get('text', '').split()
+
+        # LocalAgreement-2: the stable prefix is what this hypothesis and
+        # the previous one agree on
+        agreed = 0
+        for current, previous in zip(words, self._prev_words):
+            if current != previous:
+                break
+            agreed += 1
+        if commit_all:
+            agreed = len(words)
+
+        committed_text = ''
+        if agreed > self._committed:
+            committed_text = ' '.join(words[self._committed:agreed])
+            self._committed = agreed
+        pending = ' '.join(words[agreed:])
+
+        if commit_all:
+            self.buffer = bytearray()
+            self._prev_words = []
+            self._committed = 0
+        else:
+            self._prev_words = words
+
+        return {'status': 'success', 'committed': committed_text,
+                'pending': pending}
 
-        return model_mapping.get(self.model, 'whisper-1')
 
-# Create a default instance
-transcription_service = TranscriptionService()
\ No newline at end of file
+# Create a default instance and warm it in the background so the first
+# user request doesn't absorb the TLS handshake or model spin-up
+transcription_service = TranscriptionService()
+threading.Thread(target=transcription_service._warmup, daemon=True).start()
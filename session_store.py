@@ -0,0 +1,283 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+
+# Redis is optional; without it (or without REDIS_URL) sessions stay in-process
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SessionStore:
+    """Storage for processing sessions.
+
+    Uses Redis when a URL is configured so multiple workers can share
+    session state; otherwise falls back to an in-process store bounded by
+    an LRU size cap and a TTL. Sessions evicted from memory are spooled to
+    disk as JSON and read back through transparently, so completed results
+    survive eviction and restarts.
+    """
+
+    def __init__(self, redis_url=None, maxsize=1024, ttl=3600,
+                 spool_dir='data/sessions'):
+        """Initialize the session store.
+
+        Args:
+            redis_url (str, optional): Redis connection URL. Defaults to None.
+            maxsize (int): Max in-process sessions before LRU eviction
+            ttl (int): Seconds of inactivity before a session expires
+            spool_dir (str): Directory evicted sessions are spooled to
+        """
+        self._redis = None
+        self._local = OrderedDict()
+        self._stamps = {}
+        # One lock for the whole local backend: eviction reorders the shared
+        # OrderedDict, so per-session locks wouldn't make _touch safe
+        self._mutex = threading.RLock()
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._spool_dir = spool_dir
+
+        if redis_url:
+            if REDIS_AVAILABLE:
+                try:
+                    client = redis.Redis.from_url(redis_url)
+                    client.ping()
+                    self._redis = client
+                    logger.info("Session store using Redis backend")
+                except Exception as e:
+                    logger.error(f"Could not connect to Redis, using in-process store: {e}")
+            else:
+                logger.warning("REDIS_URL is set but the redis package is not installed")
+
+        if self._redis is None:
+            logger.info("Session store using in-process backend")
+
+    def _key(self, session_id):
+        return f"session:{session_id}"
+
+    def _spool_path(self, session_id):
+        return os.path.join(self._spool_dir, f"{session_id}.json")
+
+    def _touch(self, session_id):
+        """Mark a session as recently used and evict stale/excess ones."""
+        now = time.monotonic()
+        self._stamps[session_id] = now
+        self._local.move_to_end(session_id)
+
+        while self._local:
+            oldest = next(iter(self._local))
+            expired = now - self._stamps.get(oldest, now) > self._ttl
+            if not expired and len(self._local) <= self._maxsize:
+                break
+            self._spool(oldest, self._local.pop(oldest))
+            self._stamps.pop(oldest, None)
+
+    def _spool(self, session_id, data):
+        """Write an evicted session to disk so it survives eviction."""
+        try:
+            parts = data.pop('transcript_parts', None)
+            if parts:
+                data['transcript'] = self._merge_transcript(
+                    data.get('transcript', ''), parts)
+            os.makedirs(self._spool_dir, exist_ok=True)
+            with open(self._spool_path(session_id), 'w') as f:
+                json.dump(data, f)
+        except OSError as e:
+            logger.error(f"Could not spool session {session_id}: {e}")
+
+    def _load_spooled(self, session_id):
+        """Read a spooled session back from disk, or None."""
+        try:
+            with open(self._spool_path(session_id)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _revive(self, session_id):
+        """Get a session for writing, pulling it back from the spool.
+
+        Writes against a session that was evicted to disk must land on the
+        live copy, not be dropped while reads keep serving the stale spool.
+        Caller must hold the mutex.
+
+        Args:
+            session_id (str): Session ID
+
+        Returns:
+            dict: Mutable session data, or None if the session is unknown
+        """
+        data = self._local.get(session_id)
+        if data is None:
+            data = self._load_spooled(session_id)
+            if data is not None:
+                self._local[session_id] = data
+        return data
+
+    def _parts_key(self, session_id):
+        return f"session:{session_id}:parts"
+
+    def _merge_transcript(self, base, parts):
+        pieces = [base] if base else []
+        pieces.extend(parts)
+        return ' '.join(pieces)
+
+    def create(self, session_id, **fields):
+        """Create a new session with the given fields.
+
+        Args:
+            session_id (str): Session ID
+            **fields: Initial session fields
+        """
+        if self._redis is not None:
+            mapping = {k: json.dumps(v) for k, v in fields.items()}
+            self._redis.hset(self._key(session_id), mapping=mapping)
+        else:
+            with self._mutex:
+                self._local[session_id] = dict(fields)
+                self._touch(session_id)
+
+    def exists(self, session_id):
+        """Check whether a session exists.
+
+        Args:
+            session_id (str): Session ID
+
+        Returns:
+            bool: True if the session exists
+        """
+        if self._redis is not None:
+            return bool(self._redis.exists(self._key(session_id)))
+        return (session_id in self._local
+                or os.path.exists(self._spool_path(session_id)))
+
+    def __contains__(self, session_id):
+        return self.exists(session_id)
+
+    def get(self, session_id):
+        """Get all fields of a session.
+
+        Args:
+            session_id (str): Session ID
+
+        Returns:
+            dict: Session data, or None if the session doesn't exist
+        """
+        if self._redis is not None:
+            raw = self._redis.hgetall(self._key(session_id))
+            if not raw:
+                return None
+            data = {k.decode(): json.loads(v) for k, v in raw.items()}
+            parts = self._redis.lrange(self._parts_key(session_id), 0, -1)
+            if parts:
+                data['transcript'] = self._merge_transcript(
+                    data.get('transcript', ''), [p.decode() for p in parts])
+            return data
+        with self._mutex:
+            data = self._local.get(session_id)
+            if data is None:
+                # Read-through to the spool for sessions evicted from memory
+                return self._load_spooled(session_id)
+            self._touch(session_id)
+            parts = data.get('transcript_parts')
+            if parts:
+                data = {k: v for k, v in data.items() if k != 'transcript_parts'}
+                data['transcript'] = self._merge_transcript(data.get('transcript', ''), parts)
+            return data
+
+    def get_field(self, session_id, field, default=None):
+        """Get a single field of a session.
+
+        Args:
+            session_id (str): Session ID
+            field (str): Field name
+            default: Value to return when the field is missing
+
+        Returns:
+            The field value, or the default
+        """
+        if field == 'transcript':
+            data = self.get(session_id)
+            if data is None:
+                return default
+            return data.get('transcript', default)
+        if self._redis is not None:
+            raw = self._redis.hget(self._key(session_id), field)
+            if raw is None:
+                return default
+            return json.loads(raw)
+        data = self._local.get(session_id)
+        if data is None:
+            data = self._load_spooled(session_id)
+            if data is None:
+                return default
+        return data.get(field, default)
+
+    def update(self, session_id, **fields):
+        """Update fields of an existing session.
+
+        Args:
+            session_id (str): Session ID
+            **fields: Fields to set
+        """
+        if self._redis is not None:
+            mapping = {k: json.dumps(v) for k, v in fields.items()}
+            self._redis.hset(self._key(session_id), mapping=mapping)
+            if 'transcript' in fields:
+                self._redis.delete(self._parts_key(session_id))
+        else:
+            with self._mutex:
+                data = self._revive(session_id)
+                if data is not None:
+                    data.update(fields)
+                    if 'transcript' in fields:
+                        data.pop('transcript_parts', None)
+                    self._touch(session_id)
+
+    def append_transcript(self, session_id, text):
+        """Append a piece of text to the session transcript.
+
+        Appends are O(1): pieces accumulate in a list (or Redis list) and
+        are joined only when the transcript is read, instead of rebuilding
+        the concatenated string on every chunk.
+
+        Args:
+            session_id (str): Session ID
+            text (str): Text to append
+        """
+        if self._redis is not None:
+            self._redis.rpush(self._parts_key(session_id), text)
+        else:
+            with self._mutex:
+                data = self._revive(session_id)
+                if data is not None:
+                    data.setdefault('transcript_parts', []).append(text)
+                    self._touch(session_id)
+
+    def ids(self):
+        """Get the IDs of all known sessions.
+
+        Returns:
+            list: Session IDs
+        """
+        if self._redis is not None:
+            prefix = len('session:')
+            keys = self._redis.keys('session:*')
+            return [k.decode()[prefix:] for k in keys
+                    if not k.endswith(b':parts')]
+        known = list(self._local.keys())
+        seen = set(known)
+        if os.path.isdir(self._spool_dir):
+            for name in os.listdir(self._spool_dir):
+                if name.endswith('.json') and name[:-5] not in seen:
+                    known.append(name[:-5])
+        return known
@@ -2,6 +2,7 @@
 import os
 import sys
 import shutil
+from pathlib import Path
 
 def test_file_upload(source_file):
     """Test file upload by copying a file to the uploads directory."""
@@ -12,37 +13,25 @@ def test_file_upload(source_file):
         print(f"ERROR: Source file not found at {source_file}")
         return False
     
-    # Create uploads directory if it doesn't exist
+    # Create the uploads directory with the right mode in one call
     upload_dir = "uploads"
-    if not os.path.exists(upload_dir):
-        print(f"Creating uploads directory: {upload_dir}")
-        os.makedirs(upload_dir, exist_ok=True)
-    
-    # Make sure directory has correct permissions
-    try:
-        os.chmod(upload_dir, 0o755)
-        print(f"Set permissions on {upload_dir} to 755")
-    except Exception as e:
-        print(f"Warning: Could not set permissions: {e}")
+    Path(upload_dir).mkdir(mode=0o755, parents=True, exist_ok=True)
     
     # Get filename from path
     filename = os.path.basename(source_file)
     dest_file = os.path.join(upload_dir, filename)
     
-    # Copy the file
+    # Copy the file; copyfile uses in-kernel copy on same-filesystem
+    # copies and we don't need copy2's metadata pass
     try:
         print(f"Copying {source_file} to {dest_file}")
-        shutil.copy2(source_file, dest_file)
+        shutil.copyfile(source_file, dest_file)
         
-        # Verify file was copied
-        if os.path.exists(dest_file):
-            file_size = os.path.getsize(dest_file)
-            print(f"Success! File copied to {dest_file} ({file_size} bytes)")
-            return True
-        else:
-            print(f"ERROR: File not found at destination {dest_file}")
-            return False
-    except Exception as e:
+        # One stat both verifies the copy and reports its size
+        file_size = os.stat(dest_file).st_size
+        print(f"Success! File copied to {dest_file} ({file_size} bytes)")
+        return True
+    except OSError as e:
         print(f"ERROR: Could not copy file: {e}")
         return False
 